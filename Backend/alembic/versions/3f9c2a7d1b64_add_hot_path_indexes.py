@@ -0,0 +1,53 @@
+"""add hot path indexes
+
+Indexes for the predicates the listings and dashboards filter on. They are
+built with CREATE INDEX CONCURRENTLY so a live database keeps accepting
+writes while they build; that cannot run inside a transaction, hence the
+autocommit block.
+
+Revision ID: 3f9c2a7d1b64
+Revises:
+Create Date: 2026-10-18 10:12:41.208514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d1b64'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) - kept in sync with __table_args__ on the models
+INDEXES = [
+    ("ix_users_role_name", "users", ["role", "name"]),
+    ("ix_appointments_patient_id_date", "appointments", ["patient_id", "date"]),
+    ("ix_appointments_doctor_id_date", "appointments", ["doctor_id", "date"]),
+    ("ix_appointments_date", "appointments", ["date"]),
+    ("ix_prescriptions_doctor_id_status", "prescriptions", ["doctor_id", "status"]),
+    ("ix_prescriptions_patient_id_date", "prescriptions", ["patient_id", "date"]),
+    ("ix_billings_appointment_id_status", "billings", ["appointment_id", "status"]),
+    ("ix_billings_patient_id_date", "billings", ["patient_id", "date"]),
+    ("ix_medical_records_patient_id_date", "medical_records", ["patient_id", "date"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        # Refresh planner statistics so the new indexes are picked up right away
+        for table in sorted({table for _, table, _ in INDEXES}):
+            op.execute(sa.text(f"ANALYZE {table}"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,75 @@
+"""appointment time ranges
+
+Adds starts_at/ends_at to appointments, backfills them from `date` and
+adds an exclusion constraint so the database itself rejects overlapping
+bookings for the same doctor.
+
+Revision ID: 8b1e4d0c5a27
+Revises: 3f9c2a7d1b64
+Create Date: 2026-10-18 14:37:05.918362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.Models.appointmentmodel import APPOINTMENT_MINUTES
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e4d0c5a27'
+down_revision: Union[str, Sequence[str], None] = '3f9c2a7d1b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONSTRAINT = "ex_appointments_doctor_overlap"
+
+
+def _refuse_existing_overlaps():
+    overlaps = op.get_bind().execute(sa.text(
+        "SELECT a.id, b.id FROM appointments a JOIN appointments b "
+        "ON a.doctor_id = b.doctor_id AND a.id < b.id "
+        "AND tsrange(a.starts_at, a.ends_at, '[)') && tsrange(b.starts_at, b.ends_at, '[)') "
+        "WHERE lower(a.status) <> 'cancelled' AND lower(b.status) <> 'cancelled' "
+        "LIMIT 20"
+    )).fetchall()
+    if overlaps:
+        pairs = ", ".join(f"{first}/{second}" for first, second in overlaps)
+        raise RuntimeError(
+            "Cannot add the appointment overlap constraint: these appointments overlap for the "
+            f"same doctor: {pairs}. Cancel or move one of each pair and run the migration again."
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.add_column("appointments", sa.Column("starts_at", sa.DateTime(), nullable=True))
+    op.add_column("appointments", sa.Column("ends_at", sa.DateTime(), nullable=True))
+    op.execute(
+        sa.text(
+            "UPDATE appointments SET starts_at = date, ends_at = date + make_interval(mins => :minutes) "
+            "WHERE starts_at IS NULL"
+        ).bindparams(minutes=APPOINTMENT_MINUTES)
+    )
+    op.alter_column("appointments", "starts_at", nullable=False)
+    op.alter_column("appointments", "ends_at", nullable=False)
+
+    # Existing double bookings would make the constraint fail halfway; list them instead
+    if not op.get_context().as_sql:
+        _refuse_existing_overlaps()
+
+    # Same definition as the ExcludeConstraint on the Appointment model
+    op.execute(
+        f"ALTER TABLE appointments ADD CONSTRAINT {CONSTRAINT} "
+        "EXCLUDE USING gist (doctor_id WITH =, tsrange(starts_at, ends_at, '[)') WITH &&) "
+        "WHERE (lower(status) <> 'cancelled')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(f"ALTER TABLE appointments DROP CONSTRAINT IF EXISTS {CONSTRAINT}")
+    op.drop_column("appointments", "ends_at")
+    op.drop_column("appointments", "starts_at")
@@ -0,0 +1,42 @@
+"""add updated_at columns
+
+Row versions for the conditional GET support: ETags of list pages are
+derived from (id, updated_at). Existing rows get the migration time. The
+column is added with a non-volatile default, which PostgreSQL stores in
+the catalog instead of rewriting the table; the default is dropped again
+afterwards because the application sets the value.
+
+Revision ID: c4d2e6f8a913
+Revises: 8b1e4d0c5a27
+Create Date: 2026-10-18 16:02:19.574120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2e6f8a913'
+down_revision: Union[str, Sequence[str], None] = '8b1e4d0c5a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ["appointments", "billings", "prescriptions", "medical_records", "stock_items"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column("updated_at", sa.DateTime(), nullable=True, server_default=sa.text("timezone('utc', now())")),
+        )
+        op.alter_column(table, "updated_at", server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_column(table, "updated_at")
@@ -0,0 +1,99 @@
+"""
+Production server settings: gunicorn manages the worker processes, each of
+which serves the app on uvicorn (src/Utils/workers.py).
+
+    gunicorn -c gunicorn.conf.py index:app
+
+Every setting can be overridden from the environment (see README).
+"""
+import math
+import os
+import shutil
+import tempfile
+from dotenv import load_dotenv
+
+# The app reads .env as well, but the settings below need REDIS_URL before it loads
+load_dotenv()
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+def available_cpus() -> int:
+    """CPUs this container may use: the cgroup CPU quota if one is set, else the affinity mask."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+# The app is async, so one worker per CPU keeps every core busy
+workers = int(os.getenv("WEB_CONCURRENCY", "0")) or available_cpus()
+# Logouts and revoked tokens reach the other workers only through Redis: without
+# REDIS_URL a revoked token would still be accepted by every worker but one
+_requested_workers = workers
+if workers > 1 and not os.getenv("REDIS_URL"):
+    workers = 1
+# What the app checks at startup (index.py)
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "src.Utils.workers.ClinicHubWorker"
+
+# Import the app once in the master and fork the workers from it: faster starts,
+# and the code pages are shared between workers
+preload_app = _env_flag("PRELOAD_APP", "true")
+
+# Pending connections the kernel queues while every worker is busy
+backlog = int(os.getenv("BACKLOG", "2048"))
+# Longer than the usual load balancer idle timeout (60s), so the balancer closes
+# idle connections rather than reusing one the app has just closed
+keepalive = int(os.getenv("KEEPALIVE", "75"))
+# A worker that does not check in for this long is restarted
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+# SIGTERM: stop accepting, let in-flight requests finish for up to this long, then exit.
+# Keep the orchestrator's grace period (docker stop -t, terminationGracePeriodSeconds) above it.
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+# Recycle workers after this many requests (0 = never), with jitter so they do not restart together
+max_requests = int(os.getenv("MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "0"))
+# Proxies whose X-Forwarded-* headers are trusted
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+# Requests are logged by the app (uvicorn.access through src/Utils/logger.py)
+accesslog = None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+
+# Each worker has its own hashing pool; one process each keeps the total at one per CPU
+if workers > 1:
+    os.environ.setdefault("PASSWORD_HASH_WORKERS", "1")
+
+# /metrics merges the workers' samples from this directory (prometheus_client multiprocess
+# mode). It must be set before the app is imported and start out empty, so unless one
+# is given a fresh directory is made for every start.
+_own_metrics_dir = False
+if workers > 1 and not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="clinichub-metrics-")
+    _own_metrics_dir = True
+
+def on_starting(server):
+    if workers < _requested_workers:
+        server.log.error(
+            "REDIS_URL is not set: starting 1 worker instead of %d, since token revocations "
+            "are only shared between workers through Redis", _requested_workers,
+        )
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+def on_exit(server):
+    if _own_metrics_dir:
+        shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
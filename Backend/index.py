@@ -1,13 +1,20 @@
-import uvicorn
 import os
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, status, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError, OperationalError, IntegrityError
+from sqlalchemy.orm import configure_mappers
 
 # Load environment variables
 load_dotenv()
+# Before anything logs: JSON lines written by a background thread (src/Utils/logger.py)
+from src.Utils.logger import configure_logging, RequestIdMiddleware
+configure_logging()
 from src.routes.patientRouter import patientRouter
 from src.routes.doctorRouter import doctorRouter
 from src.routes.oauthRouter import oauthRouter
@@ -22,14 +29,105 @@ from src.routes.billingRouter import billingRouter
 from src.routes.adminRouter import adminRouter
 from src.routes.appointmentRouter import appointmentRouter
 from src.routes.dashboardRouter import router as dashboardRouter
+from src.Controllers.dashboardController import ADMIN_DASHBOARD_REFRESH_SECONDS, admin_dashboard_refresher, admin_data
+from src.Controllers.adminController import doctor_directory_controller
+from src.Utils.revocation import revocation_refresher, refresh_revocations
+from src.Services.directoryservices import doctor_directory_refresher
+from src.Utils.passwordHasher import start_hash_executor, shutdown_hash_executor
+from src.routes.metricsRouter import metricsRouter, prometheusRouter
+from src.routes.probeRouter import probeRouter
+from src.Services.readinessservices import database_status
+from src.Utils.metrics import MetricsMiddleware
+from src.Utils.db import DB_POOL_WARMUP, warm_pool, warm_async_pool, dispose_engines, slow_query_log
+from src.Utils.jwtGenerator import redis_client, close_redis_client
+from src.Utils.pagination import default_list_params
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Each startup warm-up step is abandoned after this many seconds; under gunicorn the
+# worker has to report in within WORKER_TIMEOUT, so a slow database must not hold it
+STARTUP_WARMUP_TIMEOUT = float(os.getenv("STARTUP_WARMUP_TIMEOUT", "20"))
+
+async def _lifespan_step(name: str, awaitable, timeout: float = None):
+    """Await one startup/shutdown step; a failure is logged and the others still run."""
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(awaitable, timeout)
+    except Exception as e:
+        logger.warning("%s failed: %s: %s", name, type(e).__name__, e)
+    else:
+        logger.info("%s done in %.1f ms", name, (time.perf_counter() - start) * 1000)
+
+async def _warm_database_pool():
+    await run_in_threadpool(warm_pool)
+    await warm_async_pool()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup: open the database pool and the hashing processes, fill the caches the
+    first requests would otherwise build, start the background refreshers, and only
+    then mark the app ready. Shutdown runs once the server has drained in-flight
+    requests: stop the refreshers and release the executors, Redis and the pools.
+    Logging is flushed at exit, after this, so shutdown is still logged.
+    """
+    app.state.ready = False
+    # gunicorn.conf.py falls back to one worker without Redis; other launchers (uvicorn --workers) do not
+    workers = os.getenv("WEB_CONCURRENCY", "1")
+    if redis_client is None and workers.isdigit() and int(workers) > 1:
+        logger.error(
+            "REDIS_URL is not set but WEB_CONCURRENCY=%s: a logout or revoked token only applies "
+            "in the worker that handled it. Set REDIS_URL or run a single worker.", workers,
+        )
+    # Resolve the ORM relationships now rather than inside the first query
+    configure_mappers()
+    await start_hash_executor()
+    if DB_POOL_WARMUP:
+        await _lifespan_step("Database pool warm-up", _warm_database_pool(), STARTUP_WARMUP_TIMEOUT)
+    warm_ups = [
+        _lifespan_step("Revocation list load", refresh_revocations(), STARTUP_WARMUP_TIMEOUT),
+        # Reads the migration heads, so the first /readyz does not have to
+        _lifespan_step("Readiness check", database_status(), STARTUP_WARMUP_TIMEOUT),
+        # First directory page as the patient and admin screens request it
+        _lifespan_step("Doctor directory warm-up", doctor_directory_controller(default_list_params()), STARTUP_WARMUP_TIMEOUT),
+    ]
+    if redis_client is not None:
+        warm_ups.append(_lifespan_step("Redis connection", redis_client.ping(), STARTUP_WARMUP_TIMEOUT))
+    if ADMIN_DASHBOARD_REFRESH_SECONDS > 0:
+        warm_ups.append(_lifespan_step("Admin dashboard warm-up", admin_data(), STARTUP_WARMUP_TIMEOUT))
+    await asyncio.gather(*warm_ups)
+
+    refreshers = [
+        asyncio.create_task(revocation_refresher()),
+        asyncio.create_task(admin_dashboard_refresher()),
+        asyncio.create_task(doctor_directory_refresher()),
+    ]
+    app.state.ready = True
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        for task in refreshers:
+            task.cancel()
+        await asyncio.gather(*refreshers, return_exceptions=True)
+        slow_query_log.shutdown()
+        await _lifespan_step("Password hashing pool shutdown", run_in_threadpool(shutdown_hash_executor))
+        if redis_client is not None:
+            await _lifespan_step("Redis close", close_redis_client())
+        await _lifespan_step("Database pool close", dispose_engines())
 
 app = FastAPI(
     docs_url="/docs",
     title="Clinichub Backend API",
+    # orjson renders the bodies; routes with a response_model are validated and
+    # converted by pydantic-core first
+    default_response_class=ORJSONResponse,
     redoc_url=None,
-    swagger_ui_parameters={"defaultModelsExpandDepth": -1}
+    swagger_ui_parameters={"defaultModelsExpandDepth": -1},
+    lifespan=lifespan,
 )
 
 # Only support Bearer token authentication in Swagger UI
@@ -132,7 +230,20 @@ async def integrity_error_handler(request: Request, exc: IntegrityError):
 	# When credentials are enabled, we CANNOT use "*" - use specific origin
 	allowed_origin = origin if origin in origins else (origins[0] if origins else "http://localhost:5173")
 	
-	if "duplicate" in error_msg.lower() or "unique" in error_msg.lower():
+	if "exclusion constraint" in error_msg.lower():
+		# ex_appointments_doctor_overlap: another booking overlaps this doctor's time range
+		response = JSONResponse(
+			status_code=status.HTTP_409_CONFLICT,
+			content={
+				"detail": "This time slot is already booked for the selected doctor. Please choose another time."
+			}
+		)
+		response.headers["Access-Control-Allow-Origin"] = allowed_origin
+		response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
+		response.headers["Access-Control-Allow-Headers"] = "Authorization, Content-Type, Accept, X-Requested-With"
+		response.headers["Access-Control-Allow-Credentials"] = "true"
+		return response
+	elif "duplicate" in error_msg.lower() or "unique" in error_msg.lower():
 		response = JSONResponse(
 			status_code=status.HTTP_400_BAD_REQUEST,
 			content={
@@ -220,7 +331,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 	allowed_origin = origin if origin in origins else (origins[0] if origins else "http://localhost:5173")
 	response = JSONResponse(
 		status_code=exc.status_code,
-		content={"detail": exc.detail}
+		content={"detail": exc.detail},
+		headers=getattr(exc, "headers", None)
 	)
 	# Add CORS headers
 	response.headers["Access-Control-Allow-Origin"] = allowed_origin
@@ -235,10 +347,7 @@ async def general_exception_handler(request: Request, exc: Exception):
 	if isinstance(exc, HTTPException):
 		raise exc
 	
-	# Log the full error for debugging (in production, use proper logging)
-	print(f"Unhandled exception: {type(exc).__name__}: {str(exc)}")
-	import traceback
-	print(traceback.format_exc())
+	logger.error("Unhandled exception on %s %s", request.method, request.url.path, exc_info=exc)
 	
 	origin = request.headers.get("origin")
 	# When credentials are enabled, we CANNOT use "*" - use specific origin
@@ -261,10 +370,15 @@ app.add_middleware(
     allow_origins=origins,
     allow_credentials=True,  # Set to True to allow cookies/auth headers
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-    allow_headers=["Authorization", "Content-Type", "Accept", "X-Requested-With"],  # Explicitly list headers, including Authorization
+    allow_headers=["Authorization", "Content-Type", "Accept", "X-Requested-With", "If-None-Match"],  # Explicitly list headers, including Authorization
     expose_headers=["*"],
 )
 
+# Outermost, so latency includes the other middleware and CORS preflights are counted
+app.add_middleware(MetricsMiddleware)
+# Outside the metrics so every log line of a request, slow queries included, carries its id
+app.add_middleware(RequestIdMiddleware)
+
 # Include routers
 app.include_router(patientRouter)
 app.include_router(doctorRouter)
@@ -280,10 +394,15 @@ app.include_router(billingRouter)
 app.include_router(adminRouter)
 app.include_router(appointmentRouter)
 app.include_router(dashboardRouter)
+app.include_router(metricsRouter)
+app.include_router(prometheusRouter)
+app.include_router(probeRouter)
 
 @app.get("/")
 async def read_root():
     return {"Ubutumwa": "Server iri tayali !"}
 
 if __name__ == "__main__":
+    # Development server; imported here so loading the app does not import uvicorn
+    import uvicorn
     uvicorn.run("index:app", host="0.0.0.0", port=2739, reload=True)
\ No newline at end of file
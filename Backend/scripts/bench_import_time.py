@@ -0,0 +1,98 @@
+"""
+Import-time benchmark of the app (the cold start of every worker).
+
+Imports index.py in fresh interpreters with `python -X importtime`, prints the
+median total and the packages that cost the most, and exits with status 1 when
+the median is over the budget or when a module that the app loads lazily (on
+first use) was imported with it, so CI can catch startup regressions.
+Measured without REDIS_URL; the first, discarded run writes the bytecode caches.
+
+    python scripts/bench_import_time.py [--runs 5] [--budget-ms 1500] [--top 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget for the median import of index.py; override per machine with IMPORT_TIME_BUDGET_MS
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+
+# Imported on first use only: Redis when REDIS_URL is set, passlib/argon2 in the
+# hashing processes, alembic by the readiness probe, uvicorn by the launcher
+LAZY_MODULES = ("redis", "passlib", "argon2", "alembic", "uvicorn")
+
+def import_profile() -> list:
+    """(self_us, cumulative_us, module) for every module imported with index.py, in one fresh interpreter."""
+    env = dict(os.environ)
+    # Only what index.py needs to import; nothing connects at import time
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "import-time-benchmark")
+    env.setdefault("ALGORITHM", "HS256")
+    # Set (empty) so a .env file cannot turn Redis on for the measurement
+    env["REDIS_URL"] = ""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import index"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Importing index.py failed:\n{result.stderr}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), module.strip()))
+    return rows
+
+def package_of(module: str) -> str:
+    # The app's own modules individually, everything else per top-level package
+    if module.startswith("src.") or module == "index":
+        return module
+    return module.split(".")[0]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Measured imports (the median is reported)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Fail above this median import time")
+    parser.add_argument("--top", type=int, default=15, help="Packages to list")
+    args = parser.parse_args()
+
+    import_profile()
+    profiles = [import_profile() for _ in range(args.runs)]
+    totals = [next(cumulative for _, cumulative, module in rows if module == "index") / 1000 for rows in profiles]
+    median_ms = statistics.median(totals)
+
+    # Self time per package, median over the runs
+    per_package = defaultdict(list)
+    for rows in profiles:
+        run = defaultdict(int)
+        for self_us, _, module in rows:
+            run[package_of(module)] += self_us
+        for package, self_us in run.items():
+            per_package[package].append(self_us / 1000)
+    costs = sorted(((statistics.median(values), package) for package, values in per_package.items()), reverse=True)
+
+    print(f"{'package':<40} {'self (ms)':>10}")
+    for cost, package in costs[:args.top]:
+        print(f"{package:<40} {cost:>10.1f}")
+    print(f"\nimport index: median {median_ms:.1f} ms over {args.runs} runs "
+          f"(min {min(totals):.1f}, max {max(totals):.1f}), budget {args.budget_ms:.0f} ms")
+
+    imported = {module for _, _, module in profiles[0]}
+    eager = [name for name in LAZY_MODULES if name in imported]
+    failed = False
+    if eager:
+        print(f"FAIL: imported at startup although loaded on first use: {', '.join(eager)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"FAIL: over budget by {median_ms - args.budget_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
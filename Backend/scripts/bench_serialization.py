@@ -0,0 +1,75 @@
+"""
+Benchmark of response serialization for list endpoints.
+
+Compares the old path (ORM objects through FastAPI's jsonable_encoder and the
+stdlib JSONResponse) with the current one (response_model validation and dump
+by pydantic-core, rendered by ORJSONResponse) for several list sizes.
+No database is needed: the rows are transient Appointment objects.
+
+    python scripts/bench_serialization.py [--sizes 1,10,100,1000,5000]
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from src.Models.appointmentmodel import Appointment
+from src.Middlewares.userpydanticmodel import AppointmentResponse
+
+def make_rows(count: int):
+    start = datetime(2026, 1, 5, 8, 0)
+    patient_id, doctor_id = uuid4(), uuid4()
+    return [
+        Appointment(
+            id=uuid4(),
+            patient_id=patient_id,
+            doctor_id=doctor_id,
+            date=start + timedelta(minutes=30 * index),
+            time="08:00",
+            status="Upcoming",
+            type="Consultation",
+            notes="Follow-up visit",
+        )
+        for index in range(count)
+    ]
+
+# Both paths produce the body FastAPI sends; render() is what the response class does
+def encode_before(rows) -> bytes:
+    return JSONResponse(jsonable_encoder(rows)).body
+
+adapter = TypeAdapter(list[AppointmentResponse])
+
+def encode_after(rows) -> bytes:
+    return ORJSONResponse(adapter.dump_python(adapter.validate_python(rows), mode="json")).body
+
+def best_of(fn, rows, repeat: int = 5) -> float:
+    """Best per-call time in seconds over `repeat` rounds."""
+    number = max(1, 2000 // max(len(rows), 1))
+    return min(timeit.repeat(lambda: fn(rows), number=number, repeat=repeat)) / number
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1,10,100,1000,5000", help="Comma separated list sizes")
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'before (ms)':>12} {'after (ms)':>11} {'speedup':>8}")
+    for size in [int(size) for size in args.sizes.split(",")]:
+        rows = make_rows(size)
+        # Same JSON either way, apart from key order
+        assert json.loads(encode_before(rows)) == json.loads(encode_after(rows))
+        before = best_of(encode_before, rows)
+        after = best_of(encode_after, rows)
+        print(f"{size:>6} {before * 1000:>12.3f} {after * 1000:>11.3f} {before / after:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 
+import logging
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from src.Services.admincrudservices import (
@@ -11,36 +12,55 @@ from src.Services.admincrudservices import (
 	update_patient,
 	delete_patient
 )
+from src.Utils.pagination import Page
+from src.Utils.db import run_in_session
+from src.Services.directoryservices import get_doctor_directory
 
-def list_doctors_controller(db: Session):
+logger = logging.getLogger(__name__)
+
+def _role_value(role):
+	return role.value if role is not None else None
+
+def _doctor_row(row) -> dict:
+	return {
+		"id": str(row.id),
+		"name": row.name or "",
+		"email": row.email or "",
+		"phone": row.phone or "",
+		"address": row.address or "",
+		"role": _role_value(row.role),
+		"profile_image": row.profile_image,
+		"specialization": row.specialization,
+		"license_number": row.license_number,
+	}
+
+def _patient_row(row) -> dict:
+	return {
+		"id": str(row.id),
+		"user_id": str(row.id),
+		"name": row.name or "",
+		"email": row.email or "",
+		"phone": row.phone or "",
+		"address": row.address or "",
+		"role": _role_value(row.role),
+		"profile_image": row.profile_image,
+	}
+
+def list_doctors_controller(db: Session, params: dict):
 	try:
-		doctors = list_doctors(db)
-		# Convert SQLAlchemy objects to dictionaries
-		result = []
-		for doc in doctors:
-			try:
-				role_value = doc.role.value if hasattr(doc.role, 'value') else str(doc.role)
-			except:
-				role_value = str(doc.role) if doc.role else None
-			
-			result.append({
-				"id": str(doc.id),
-				"name": doc.name or "",
-				"email": doc.email or "",
-				"phone": doc.phone or "",
-				"address": doc.address or "",
-				"role": role_value,
-				"profile_image": getattr(doc, 'profile_image', None),
-				"specialization": getattr(doc, 'specialization', None),
-				"license_number": getattr(doc, 'license_number', None),
-			})
-		return result
+		page = list_doctors(db, params)
+		# Rows are column tuples (see DOCTOR_LIST_COLUMNS), mapped straight to the output
+		return Page([_doctor_row(row) for row in page.items], page.next_cursor, page.etag)
+	except HTTPException:
+		raise
 	except Exception as e:
-		import traceback
-		print(f"Error in list_doctors_controller: {type(e).__name__}: {str(e)}")
-		print(traceback.format_exc())
+		logger.exception("Error in list_doctors_controller")
 		raise HTTPException(status_code=500, detail=f"Failed to retrieve doctors: {str(e)}")
 
+async def doctor_directory_controller(params: dict) -> Page:
+	"""list_doctors_controller() served from the directory cache; misses run in their own session."""
+	return await get_doctor_directory(params, lambda: run_in_session(list_doctors_controller, params))
+
 def create_doctor_controller(db: Session, doctor: dict):
 	doc = create_doctor(db, doctor)
 	if not doc:
@@ -81,32 +101,15 @@ def delete_doctor_controller(db: Session, doctor_id: str):
 		raise HTTPException(status_code=404, detail="Doctor not found")
 	return {"message": "Doctor deleted"}
 
-def list_patients_controller(db: Session):
+def list_patients_controller(db: Session, params: dict):
 	try:
-		patients = list_patients(db)
-		# Convert SQLAlchemy objects to dictionaries
-		result = []
-		for pat in patients:
-			try:
-				role_value = pat.role.value if hasattr(pat.role, 'value') else str(pat.role)
-			except:
-				role_value = str(pat.role) if pat.role else None
-			
-			result.append({
-				"id": str(pat.id),
-				"user_id": str(pat.id),
-				"name": pat.name or "",
-				"email": pat.email or "",
-				"phone": pat.phone or "",
-				"address": pat.address or "",
-				"role": role_value,
-				"profile_image": getattr(pat, 'profile_image', None),
-			})
-		return result
+		page = list_patients(db, params)
+		# Rows are column tuples (see PATIENT_LIST_COLUMNS), mapped straight to the output
+		return Page([_patient_row(row) for row in page.items], page.next_cursor, page.etag)
+	except HTTPException:
+		raise
 	except Exception as e:
-		import traceback
-		print(f"Error in list_patients_controller: {type(e).__name__}: {str(e)}")
-		print(traceback.format_exc())
+		logger.exception("Error in list_patients_controller")
 		raise HTTPException(status_code=500, detail=f"Failed to retrieve patients: {str(e)}")
 
 def create_patient_controller(db: Session, patient: dict):
@@ -1,4 +1,5 @@
 
+import logging
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from src.Services.appointmentservices import (
@@ -6,9 +7,12 @@ from src.Services.appointmentservices import (
 	get_appointment,
 	update_appointment,
 	delete_appointment,
-	list_appointments
+	list_appointments,
+	appointments_export_statement
 )
 
+logger = logging.getLogger(__name__)
+
 def create_appointment_controller(db: Session, appointment: dict):
 	appt = create_appointment(db, appointment)
 	if not appt:
@@ -33,16 +37,17 @@ def delete_appointment_controller(db: Session, appointment_id: str):
 		raise HTTPException(status_code=404, detail="Appointment not found")
 	return {"message": "Appointment deleted"}
 
-def list_appointments_controller(db: Session):
+def list_appointments_controller(db: Session, params: dict):
 	try:
-		return list_appointments(db)
+		return list_appointments(db, params)
 	except HTTPException:
 		raise
 	except Exception as e:
-		import traceback
-		print(f"Unexpected error in list_appointments_controller: {type(e).__name__}: {str(e)}")
-		print(traceback.format_exc())
+		logger.exception("Unexpected error in list_appointments_controller")
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			detail=f"Failed to retrieve appointments: {str(e)}"
 		)
+
+def export_appointments_controller(params: dict):
+	return appointments_export_statement(params)
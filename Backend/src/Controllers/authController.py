@@ -1,11 +1,10 @@
 
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
 from src.Services.authservices import authenticate_user
 from src.Utils.jwtGenerator import create_access_token
 
-def login_controller(db: Session, email: str, password: str):
-    user = authenticate_user(db, email, password)
+async def login_controller(db, email: str, password: str):
+    user = await authenticate_user(db, email, password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
@@ -6,7 +6,8 @@ from src.Services.billingservices import (
 	get_billing,
 	update_billing,
 	delete_billing,
-	list_billings
+	list_billings,
+	billings_export_statement
 )
 
 def create_billing_controller(db: Session, billing: dict):
@@ -33,5 +34,8 @@ def delete_billing_controller(db: Session, billing_id: str):
 		raise HTTPException(status_code=404, detail="Billing not found")
 	return {"message": "Billing deleted"}
 
-def list_billings_controller(db: Session):
-	return list_billings(db)
+def list_billings_controller(db: Session, params: dict):
+	return list_billings(db, params)
+
+def export_billings_controller(params: dict):
+	return billings_export_statement(params)
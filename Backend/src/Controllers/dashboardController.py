@@ -1,12 +1,55 @@
 # Controller for admin dashboard
-from fastapi import Depends
+import asyncio
+import logging
+import os
+import time
 from ..Services.dashboard import get_admin_dashboard_data, get_doctor_dashboard_data
-from ..Utils.db import get_db
+from ..Utils.db import run_in_session
 from sqlalchemy.orm import Session
 
+logger = logging.getLogger(__name__)
 
-def admin_data(db: Session = Depends(get_db)):
-    return get_admin_dashboard_data(db)
+# The admin counters are recomputed by a background task every interval and
+# served from memory in between, so polling admins don't each hit the database.
+# 0 disables the snapshot and computes the counters on every request.
+ADMIN_DASHBOARD_REFRESH_SECONDS = float(os.getenv("ADMIN_DASHBOARD_REFRESH_SECONDS", "30"))
+
+_admin_snapshot = {"data": None, "refreshed_at": 0.0}
+_admin_refresh_lock = asyncio.Lock()
+
+
+def _admin_snapshot_fresh() -> bool:
+    # Allow one missed refresh before treating the snapshot as stale
+    age = time.monotonic() - _admin_snapshot["refreshed_at"]
+    return _admin_snapshot["data"] is not None and age < 2 * ADMIN_DASHBOARD_REFRESH_SECONDS
+
+async def refresh_admin_data():
+    data = await run_in_session(get_admin_dashboard_data)
+    _admin_snapshot["data"] = data
+    _admin_snapshot["refreshed_at"] = time.monotonic()
+    return data
+
+async def admin_data():
+    if ADMIN_DASHBOARD_REFRESH_SECONDS <= 0:
+        return await run_in_session(get_admin_dashboard_data)
+    if not _admin_snapshot_fresh():
+        # Refresher not running yet (or stalled): one request recomputes, the rest wait for it
+        async with _admin_refresh_lock:
+            if not _admin_snapshot_fresh():
+                await refresh_admin_data()
+    return dict(_admin_snapshot["data"])
+
+async def admin_dashboard_refresher():
+    """Background loop started with the app; keeps the admin snapshot current."""
+    if ADMIN_DASHBOARD_REFRESH_SECONDS <= 0:
+        return
+    while True:
+        try:
+            async with _admin_refresh_lock:
+                await refresh_admin_data()
+        except Exception as e:
+            logger.warning("Admin dashboard refresh failed: %s: %s", type(e).__name__, e)
+        await asyncio.sleep(ADMIN_DASHBOARD_REFRESH_SECONDS)
 
 def doctor_data(db: Session, doctor_id: str):
     return get_doctor_dashboard_data(db, doctor_id)
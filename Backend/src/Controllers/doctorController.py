@@ -1,11 +1,17 @@
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from src.Middlewares.userpydanticmodel import UserRegister, UserEdit
 from src.Services.doctorservices import create_user_doctor, get_user_doctor, update_user_doctor, delete_user_doctor
+from src.Controllers.medicalrecordController import create_medicalrecord_controller
+from src.Models.medicalrecordmodel import MedicalRecord
+from src.Models.usermodel import User, UserRole
+from src.Services.availabilityservices import get_doctor_availability, MAX_AVAILABILITY_DAYS
+from uuid import UUID
+from datetime import date, datetime, timedelta
 
-def register_doctor_controller(db: Session, user: UserRegister):
+def register_doctor_controller(db: Session, user: UserRegister, password_hash: str = None):
     user.role = "doctor"
-    db_user = create_user_doctor(db, user)
+    db_user = create_user_doctor(db, user, password_hash)
     if not db_user:
         raise HTTPException(status_code=400, detail="Registration failed")
     return db_user
@@ -63,3 +69,73 @@ def delete_doctor_profile_controller(db: Session, user_id: str):
     if not deleted:
         raise HTTPException(status_code=404, detail="Doctor not found")
     return {"message": "Profile deleted"}
+
+def get_patient_records_controller(db: Session, patient_id: UUID):
+    # Get medical records for this patient
+    # Doctor names are loaded by the same query (LEFT JOIN), not one query per record
+    medical_records = (
+        db.query(MedicalRecord)
+        .options(joinedload(MedicalRecord.doctor).load_only(User.name))
+        .filter(MedicalRecord.patient_id == patient_id)
+        .all()
+    )
+    
+    # Convert SQLAlchemy objects to dictionaries for JSON serialization
+    result = []
+    for record in medical_records:
+        doctor = record.doctor
+        result.append({
+            "id": str(record.id),
+            "patient_id": str(record.patient_id),
+            "doctor_id": str(record.doctor_id),
+            "doctor_name": doctor.name if doctor else "Unknown Doctor",
+            "type": record.type or "",
+            "title": record.title or "",
+            "date": record.date.isoformat() if record.date else None,
+            "details": record.details or None,
+        })
+    return result
+
+def create_patient_record_controller(db: Session, doctor_id: str, patient_id: UUID, record_data: dict):
+    patient = db.query(User).filter(User.id == patient_id).first()
+    if not patient:
+        raise HTTPException(status_code=404, detail="Patient not found")
+    
+    # Create medical record data
+    medical_record_dict = {
+        "patient_id": str(patient_id),
+        "doctor_id": doctor_id,
+        "type": record_data.get("type"),
+        "title": record_data.get("title"),
+        "details": record_data.get("details", ""),
+    }
+    
+    # Create medical record
+    medical_record = create_medicalrecord_controller(db, medical_record_dict)
+    
+    # Convert to dict for response
+    return {
+        "id": str(medical_record.id),
+        "patient_id": str(medical_record.patient_id),
+        "doctor_id": str(medical_record.doctor_id),
+        "type": medical_record.type,
+        "title": medical_record.title,
+        "date": medical_record.date.isoformat() if medical_record.date else None,
+        "details": medical_record.details,
+        "message": "Medical record created successfully"
+    }
+
+def get_doctor_availability_controller(db: Session, doctor_id: UUID, date_from: date = None, date_to: date = None):
+    doctor = db.query(User.id).filter(User.id == doctor_id, User.role == UserRole.DOCTOR).first()
+    if not doctor:
+        raise HTTPException(status_code=404, detail="Doctor not found")
+
+    # Default to the coming week; `to` is exclusive
+    date_from = date_from or datetime.utcnow().date()
+    date_to = date_to or date_from + timedelta(days=7)
+    if date_to <= date_from:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    if (date_to - date_from).days > MAX_AVAILABILITY_DAYS:
+        raise HTTPException(status_code=400, detail=f"Availability can be requested for at most {MAX_AVAILABILITY_DAYS} days at a time")
+
+    return get_doctor_availability(db, doctor_id, date_from, date_to)
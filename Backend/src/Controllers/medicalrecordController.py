@@ -33,5 +33,5 @@ def delete_medicalrecord_controller(db: Session, record_id: str):
 		raise HTTPException(status_code=404, detail="Medical record not found")
 	return {"message": "Medical record deleted"}
 
-def list_medicalrecords_controller(db: Session):
-	return list_medicalrecords(db)
+def list_medicalrecords_controller(db: Session, params: dict):
+	return list_medicalrecords(db, params)
@@ -1,11 +1,19 @@
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from src.Middlewares.userpydanticmodel import UserRegister, UserEdit
 from src.Services.patientservices import create_user_patient, get_user_patient, update_user_patient, delete_user_patient
+from src.Services.timelineservices import list_patient_timeline
+from src.Controllers.appointmentController import create_appointment_controller
+from src.Models.appointmentmodel import Appointment
+from src.Models.prescriptionmodel import Prescription
+from src.Models.medicalrecordmodel import MedicalRecord
+from src.Models.usermodel import User, UserRole
+from uuid import UUID
+from datetime import datetime
 
-def register_patient_controller(db: Session, user: UserRegister):
+def register_patient_controller(db: Session, user: UserRegister, password_hash: str = None):
     user.role = "patient"
-    db_user = create_user_patient(db, user)
+    db_user = create_user_patient(db, user, password_hash)
     if not db_user:
         raise HTTPException(status_code=400, detail="Registration failed")
     return db_user
@@ -27,3 +35,137 @@ def delete_patient_profile_controller(db: Session, user_id: str):
     if not deleted:
         raise HTTPException(status_code=404, detail="Patient not found")
     return {"message": "Profile deleted"}
+
+def list_patient_appointments_controller(db: Session, patient_id: UUID):
+    # Doctor name/specialization come from the same query (LEFT JOIN), not one query per row
+    appointments = (
+        db.query(Appointment)
+        .options(joinedload(Appointment.doctor).load_only(User.name, User.specialization))
+        .filter(Appointment.patient_id == patient_id)
+        .all()
+    )
+    # Convert SQLAlchemy objects to dictionaries for JSON serialization
+    result = []
+    for appointment in appointments:
+        doctor = appointment.doctor
+        result.append({
+            "id": str(appointment.id),
+            "patient_id": str(appointment.patient_id),
+            "doctor_id": str(appointment.doctor_id),
+            "doctor_name": doctor.name if doctor else "Unknown Doctor",
+            "doctor_specialization": (doctor.specialization if doctor else None) or "General",
+            "date": appointment.date.isoformat() if appointment.date else None,
+            "time": appointment.time,
+            "status": appointment.status,
+            "type": appointment.type,
+            "notes": appointment.notes,
+        })
+    return result
+
+def book_appointment_controller(db: Session, patient_id: str, appointment_data: dict):
+    # Validate required fields
+    doctor_id = appointment_data.get("doctor_id")
+    date = appointment_data.get("date")
+    time = appointment_data.get("time")
+    appointment_type = appointment_data.get("type")
+
+    if not doctor_id:
+        raise HTTPException(status_code=400, detail="Doctor ID is required")
+    if not date:
+        raise HTTPException(status_code=400, detail="Appointment date is required")
+    if not time:
+        raise HTTPException(status_code=400, detail="Appointment time is required")
+    if not appointment_type:
+        raise HTTPException(status_code=400, detail="Appointment type is required")
+
+    # Validate doctor exists and is actually a doctor
+    try:
+        doctor_uuid = UUID(doctor_id) if isinstance(doctor_id, str) else doctor_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid doctor ID format")
+
+    doctor = db.query(User).filter(User.id == doctor_uuid, User.role == UserRole.DOCTOR).first()
+    if not doctor:
+        raise HTTPException(status_code=404, detail="Doctor not found")
+
+    # Parse and validate date
+    try:
+        if isinstance(date, str):
+            appointment_date = datetime.fromisoformat(date.replace('Z', '+00:00'))
+        else:
+            appointment_date = date
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)")
+
+    # Create appointment data
+    appointment_dict = {
+        "patient_id": patient_id,
+        "doctor_id": str(doctor_uuid),
+        "date": appointment_date.isoformat() if isinstance(appointment_date, datetime) else date,
+        "time": time,
+        "type": appointment_type,
+        "status": "Upcoming",
+        "notes": appointment_data.get("notes", "")
+    }
+
+    # Create appointment
+    appointment = create_appointment_controller(db, appointment_dict)
+
+    # Convert to dict for response
+    return {
+        "id": str(appointment.id),
+        "patient_id": str(appointment.patient_id),
+        "doctor_id": str(appointment.doctor_id),
+        "date": appointment.date.isoformat() if appointment.date else None,
+        "time": appointment.time,
+        "status": appointment.status,
+        "type": appointment.type,
+        "notes": appointment.notes,
+        "message": "Appointment booked successfully"
+    }
+
+def list_patient_prescriptions_controller(db: Session, patient_id: UUID):
+    prescriptions = db.query(Prescription).filter(Prescription.patient_id == patient_id).all()
+    # Convert SQLAlchemy objects to dictionaries for JSON serialization
+    result = []
+    for prescription in prescriptions:
+        result.append({
+            "id": str(prescription.id),
+            "patient_id": str(prescription.patient_id),
+            "doctor_id": str(prescription.doctor_id),
+            "medication": prescription.medication or "",
+            "dosage": prescription.dosage or "",
+            "duration": prescription.duration or "",
+            "date": prescription.date.isoformat() if prescription.date else None,
+            "status": prescription.status or "",
+            "notes": prescription.notes or None,
+        })
+    return result
+
+def list_patient_records_controller(db: Session, patient_id: UUID):
+    medical_records = (
+        db.query(MedicalRecord)
+        .options(joinedload(MedicalRecord.doctor).load_only(User.name, User.specialization))
+        .filter(MedicalRecord.patient_id == patient_id)
+        .all()
+    )
+    # Convert SQLAlchemy objects to dictionaries for JSON serialization
+    result = []
+    for record in medical_records:
+        doctor = record.doctor
+        result.append({
+            "id": str(record.id),
+            "patient_id": str(record.patient_id),
+            "doctor_id": str(record.doctor_id),
+            "doctor_name": doctor.name if doctor else "Unknown Doctor",
+            "doctor_specialization": (doctor.specialization if doctor else None) or "General",
+            "type": record.type or "",
+            "title": record.title or "",
+            "date": record.date.isoformat() if record.date else None,
+            "details": record.details or None,
+        })
+    return result
+
+def list_patient_timeline_controller(db: Session, patient_id: UUID, params: dict):
+    # One UNION ALL statement with the doctor joined in; see timelineservices
+    return list_patient_timeline(db, patient_id, params)
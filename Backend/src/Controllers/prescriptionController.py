@@ -33,5 +33,5 @@ def delete_prescription_controller(db: Session, prescription_id: str):
 		raise HTTPException(status_code=404, detail="Prescription not found")
 	return {"message": "Prescription deleted"}
 
-def list_prescriptions_controller(db: Session):
-	return list_prescriptions(db)
+def list_prescriptions_controller(db: Session, params: dict):
+	return list_prescriptions(db, params)
@@ -1,4 +1,5 @@
 
+import logging
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from src.Services.stockservices import (
@@ -9,6 +10,8 @@ from src.Services.stockservices import (
 	list_stock_items
 )
 
+logger = logging.getLogger(__name__)
+
 def create_stock_controller(db: Session, item: dict):
 	try:
 		stock = create_stock_item(db, item)
@@ -23,9 +26,7 @@ def create_stock_controller(db: Session, item: dict):
 		raise
 	except Exception as e:
 		# Log the full error for debugging
-		import traceback
-		print(f"Unexpected error in create_stock_controller: {type(e).__name__}: {str(e)}")
-		print(traceback.format_exc())
+		logger.exception("Unexpected error in create_stock_controller")
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			detail=f"Failed to create stock item: {str(e)}"
@@ -71,9 +72,9 @@ def delete_stock_controller(db: Session, item_id: str):
 			detail=f"Failed to delete stock item: {str(e)}"
 		)
 
-def list_stock_controller(db: Session):
+def list_stock_controller(db: Session, params: dict):
 	try:
-		return list_stock_items(db)
+		return list_stock_items(db, params)
 	except HTTPException:
 		raise
 	except Exception as e:
@@ -3,7 +3,7 @@ from pydantic import BaseModel, EmailStr, constr, Field, field_validator, Config
 from typing import Optional
 from enum import Enum
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
 
 
 class UserRole(str, Enum):
@@ -167,4 +167,104 @@ class BillingUpdate(BaseModel):
 			result["status"] = self.status
 		if self.description is not None:
 			result["description"] = self.description
-		return result
\ No newline at end of file
+		return result
+
+
+# Response models. Routes declare them as response_model, so ORM objects are read
+# through from_attributes and serialized by pydantic-core instead of jsonable_encoder,
+# and only the listed fields can reach the client.
+
+class ORMResponse(BaseModel):
+	model_config = ConfigDict(from_attributes=True)
+
+class AppointmentResponse(ORMResponse):
+	id: UUID
+	patient_id: UUID
+	doctor_id: UUID
+	date: datetime
+	time: str
+	starts_at: datetime
+	ends_at: datetime
+	status: str
+	type: str
+	notes: Optional[str] = None
+
+class BillingResponse(ORMResponse):
+	id: UUID
+	patient_id: UUID
+	appointment_id: Optional[UUID] = None
+	amount: float
+	status: str
+	date: Optional[datetime] = None
+	description: Optional[str] = None
+
+class PrescriptionResponse(ORMResponse):
+	id: UUID
+	patient_id: UUID
+	doctor_id: UUID
+	medication: str
+	dosage: str
+	duration: str
+	date: Optional[datetime] = None
+	status: str
+	notes: Optional[str] = None
+
+class MedicalRecordResponse(ORMResponse):
+	id: UUID
+	patient_id: UUID
+	doctor_id: UUID
+	type: str
+	title: str
+	date: Optional[datetime] = None
+	details: Optional[str] = None
+
+class StockItemResponse(ORMResponse):
+	id: UUID
+	name: str
+	category: Optional[str] = None
+	quantity: int
+	unit: Optional[str] = None
+	supplier: Optional[str] = None
+	cost_per_unit: Optional[float] = None
+	expiry_date: Optional[date] = None
+	location: Optional[str] = None
+	description: Optional[str] = None
+	min_stock_level: int
+
+class UserProfileResponse(ORMResponse):
+	"""A user's own profile. The password hash is deliberately not a field."""
+	id: UUID
+	name: Optional[str] = None
+	email: str
+	phone: Optional[str] = None
+	address: Optional[str] = None
+	role: Optional[str] = None
+	profile_image: Optional[str] = None
+	specialization: Optional[str] = None
+	license_number: Optional[str] = None
+	oauth_provider: Optional[str] = None
+	created_at: Optional[datetime] = None
+	updated_at: Optional[datetime] = None
+
+	@field_validator("role", mode="before")
+	@classmethod
+	def _role_value(cls, value):
+		# The ORM column holds the usermodel.UserRole enum
+		return getattr(value, "value", value)
+
+class ProfileUpdateResponse(BaseModel):
+	message: str
+	user: UserProfileResponse
+
+class TimelineEntryResponse(ORMResponse):
+	"""One row of the patient timeline; fields a kind does not have are null."""
+	kind: str  # appointment, prescription, medical_record or billing
+	id: UUID
+	date: datetime
+	title: Optional[str] = None
+	status: Optional[str] = None
+	details: Optional[str] = None
+	amount: Optional[float] = None
+	doctor_id: Optional[UUID] = None
+	doctor_name: Optional[str] = None
+	doctor_specialization: Optional[str] = None
@@ -1,18 +1,61 @@
 
-from sqlalchemy import Column, String, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
-from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, DDL, event, text
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
+from sqlalchemy.orm import relationship, validates
+from datetime import datetime, timedelta
+import os
 import uuid
 
 from src.Models.usermodel import Base
+from src.Utils.datetimes import coerce_datetime
+
+# Length of an appointment; also the slot size used by the availability index
+APPOINTMENT_MINUTES = int(os.getenv("APPOINTMENT_SLOT_MINUTES", "30"))
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # Patient/doctor listings and per-doctor "today" counts (range on date)
+        Index("ix_appointments_patient_id_date", "patient_id", "date"),
+        Index("ix_appointments_doctor_id_date", "doctor_id", "date"),
+        # Clinic-wide "today" counts and the default date sort
+        Index("ix_appointments_date", "date"),
+        # The database refuses overlapping bookings for the same doctor, whichever
+        # worker (or script) writes them. Needs the btree_gist extension for `=` on uuid.
+        ExcludeConstraint(
+            ("doctor_id", "="),
+            (text("tsrange(starts_at, ends_at, '[)')"), "&&"),
+            name="ex_appointments_doctor_overlap",
+            using="gist",
+            where=text("lower(status) <> 'cancelled'"),
+        ).ddl_if(dialect="postgresql"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     patient_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     doctor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     date = Column(DateTime, nullable=False)
     time = Column(String, nullable=False)
+    # [starts_at, ends_at) of the visit, derived from `date`
+    starts_at = Column(DateTime, nullable=False)
+    ends_at = Column(DateTime, nullable=False)
     status = Column(String, nullable=False, default="Upcoming")
     type = Column(String, nullable=False)
     notes = Column(String, nullable=True)
+    # Row version: ETags of list pages are derived from (id, updated_at)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    patient = relationship("User", foreign_keys=[patient_id])
+    doctor = relationship("User", foreign_keys=[doctor_id])
+
+    @validates("date")
+    def _validate_date(self, key, value):
+        value = coerce_datetime(value)
+        self.starts_at = value
+        self.ends_at = value + timedelta(minutes=APPOINTMENT_MINUTES) if value is not None else None
+        return value
+
+event.listen(
+    Appointment.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
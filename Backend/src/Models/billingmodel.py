@@ -1,14 +1,21 @@
 
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import validates
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 import uuid
 
 from src.Models.usermodel import Base
+from src.Utils.datetimes import coerce_datetime
 
 class Billing(Base):
     __tablename__ = "billings"
+    __table_args__ = (
+        # Doctor earnings join paid bills on appointment_id
+        Index("ix_billings_appointment_id_status", "appointment_id", "status"),
+        Index("ix_billings_patient_id_date", "patient_id", "date"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     patient_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     appointment_id = Column(UUID(as_uuid=True), ForeignKey("appointments.id"), nullable=True)
@@ -16,3 +23,9 @@ class Billing(Base):
     status = Column(String, nullable=False, default="Pending")
     date = Column(DateTime, default=datetime.utcnow)
     description = Column(String, nullable=True)
+    # Row version: ETags of list pages are derived from (id, updated_at)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @validates("date")
+    def _validate_date(self, key, value):
+        return coerce_datetime(value)
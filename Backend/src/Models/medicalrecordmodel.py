@@ -1,13 +1,18 @@
 
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 import uuid
 
 from src.Models.usermodel import Base
+from src.Utils.datetimes import coerce_datetime
 
 class MedicalRecord(Base):
     __tablename__ = "medical_records"
+    __table_args__ = (
+        Index("ix_medical_records_patient_id_date", "patient_id", "date"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     patient_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     doctor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -15,3 +20,12 @@ class MedicalRecord(Base):
     title = Column(String, nullable=False)
     date = Column(DateTime, default=datetime.utcnow)
     details = Column(String, nullable=True)
+    # Row version: ETags of list pages are derived from (id, updated_at)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    patient = relationship("User", foreign_keys=[patient_id])
+    doctor = relationship("User", foreign_keys=[doctor_id])
+
+    @validates("date")
+    def _validate_date(self, key, value):
+        return coerce_datetime(value)
@@ -1,13 +1,20 @@
 
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 import uuid
 
 from src.Models.usermodel import Base
+from src.Utils.datetimes import coerce_datetime
 
 class Prescription(Base):
     __tablename__ = "prescriptions"
+    __table_args__ = (
+        # Doctor dashboard "pending reports" (doctor_id + status = 'Active')
+        Index("ix_prescriptions_doctor_id_status", "doctor_id", "status"),
+        Index("ix_prescriptions_patient_id_date", "patient_id", "date"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     patient_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     doctor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -17,3 +24,12 @@ class Prescription(Base):
     date = Column(DateTime, default=datetime.utcnow)
     status = Column(String, nullable=False, default="Active")
     notes = Column(String, nullable=True)
+    # Row version: ETags of list pages are derived from (id, updated_at)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    patient = relationship("User", foreign_keys=[patient_id])
+    doctor = relationship("User", foreign_keys=[doctor_id])
+
+    @validates("date")
+    def _validate_date(self, key, value):
+        return coerce_datetime(value)
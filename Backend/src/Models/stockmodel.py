@@ -1,6 +1,7 @@
 
-from sqlalchemy import Column, String, Integer, Float, Date
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime
 from sqlalchemy.ext.declarative import declarative_base
+from datetime import datetime
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -19,3 +20,5 @@ class StockItem(Base):
     location = Column(String, nullable=True)
     description = Column(String, nullable=True)
     min_stock_level = Column(Integer, nullable=False, default=0)
+    # Row version: ETags of list pages are derived from (id, updated_at)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,10 +1,35 @@
 
 from src.Models.usermodel import User, UserRole
 from uuid import uuid4
+from src.Utils.pagination import paginate
+from src.Services.directoryservices import invalidate_doctor_directory
+
+_USER_SORT_COLUMNS = {"name": User.name, "email": User.email, "created_at": User.created_at}
+
+# Columns each directory row shows; lists select only these (no password hash, OAuth
+# ids or ORM identity map). created_at is there for the created_at sort cursor,
+# updated_at for the page ETag.
+DOCTOR_LIST_COLUMNS = (
+	User.id, User.name, User.email, User.phone, User.address, User.role,
+	User.profile_image, User.specialization, User.license_number, User.created_at, User.updated_at,
+)
+PATIENT_LIST_COLUMNS = (
+	User.id, User.name, User.email, User.phone, User.address, User.role,
+	User.profile_image, User.created_at, User.updated_at,
+)
 
 # Doctor CRUD
-def list_doctors(db):
-	return db.query(User).filter(User.role == UserRole.DOCTOR).all()
+def list_doctors(db, params: dict):
+	return paginate(
+		db.query(*DOCTOR_LIST_COLUMNS).filter(User.role == UserRole.DOCTOR),
+		params,
+		sort_columns=_USER_SORT_COLUMNS,
+		id_column=User.id,
+		version_column=User.updated_at,
+		filter_columns={"date": User.created_at},
+		default_sort="name",
+		default_order="asc",
+	)
 
 def create_doctor(db, doctor: dict):
 	doc = User(
@@ -21,6 +46,7 @@ def create_doctor(db, doctor: dict):
 	)
 	db.add(doc)
 	db.commit()
+	invalidate_doctor_directory()
 	db.refresh(doc)
 	return doc
 
@@ -31,6 +57,7 @@ def update_doctor(db, doctor_id: str, doctor: dict):
 	for field, value in doctor.items():
 		setattr(doc, field, value)
 	db.commit()
+	invalidate_doctor_directory()
 	db.refresh(doc)
 	return doc
 
@@ -40,11 +67,21 @@ def delete_doctor(db, doctor_id: str):
 		return None
 	db.delete(doc)
 	db.commit()
+	invalidate_doctor_directory()
 	return doc
 
 # Patient CRUD
-def list_patients(db):
-	return db.query(User).filter(User.role == UserRole.PATIENT).all()
+def list_patients(db, params: dict):
+	return paginate(
+		db.query(*PATIENT_LIST_COLUMNS).filter(User.role == UserRole.PATIENT),
+		params,
+		sort_columns=_USER_SORT_COLUMNS,
+		id_column=User.id,
+		version_column=User.updated_at,
+		filter_columns={"date": User.created_at},
+		default_sort="name",
+		default_order="asc",
+	)
 
 def create_patient(db, patient: dict):
 	pat = User(
@@ -1,26 +1,66 @@
 
+import logging
 from src.Models.appointmentmodel import Appointment
 from uuid import uuid4
-from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError, OperationalError, IntegrityError, ProgrammingError
 from fastapi import HTTPException, status
+from sqlalchemy import select
+from src.Utils.pagination import paginate, apply_filters
+from src.Services.dashboard import invalidate_doctor_dashboard
+from src.Services.availabilityservices import SLOT_MINUTES, availability_index, occupies_slot, on_slot_grid, slots_of
+
+logger = logging.getLogger(__name__)
+
+SLOT_TAKEN_DETAIL = "This time slot is already booked for the selected doctor. Please choose another time."
+OFF_GRID_DETAIL = f"Appointments start on the {SLOT_MINUTES}-minute slot grid (for example 09:00 or 09:30)."
+
+def _require_slot_start(start):
+	# Only slot-aligned bookings fill exactly the slot the availability index marks,
+	# i.e. the same range ex_appointments_doctor_overlap checks
+	if start is not None and not on_slot_grid(start):
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=OFF_GRID_DETAIL)
+
+def _raise_if_overlap(db, error: Exception):
+	# ex_appointments_doctor_overlap caught a booking the in-process index could not see
+	# (one made through another worker)
+	if isinstance(error, IntegrityError) and "ex_appointments_doctor_overlap" in str(error.orig):
+		db.rollback()
+		raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_TAKEN_DETAIL)
 
 def create_appointment(db, appointment: dict):
+	# No default start time: a missing date would silently book "now", off the slot grid
+	if appointment.get("date") is None:
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Appointment date is required")
 	appt = Appointment(
 		id=uuid4(),
 		patient_id=appointment.get("patient_id"),
 		doctor_id=appointment.get("doctor_id"),
-		date=appointment.get("date", datetime.utcnow()),
+		date=appointment["date"],
 		time=appointment.get("time"),
 		status=appointment.get("status", "Upcoming"),
 		type=appointment.get("type"),
 		notes=appointment.get("notes")
 	)
-	db.add(appt)
-	db.commit()
+	_require_slot_start(appt.date)
+	holds_slot = occupies_slot(appt.status)
+	if holds_slot and not availability_index.reserve(db, appt.doctor_id, appt.date):
+		raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_TAKEN_DETAIL)
+	try:
+		db.add(appt)
+		db.commit()
+	except Exception as e:
+		if holds_slot:
+			availability_index.release(appt.doctor_id, appt.date)
+		_raise_if_overlap(db, e)
+		raise
 	db.refresh(appt)
+	invalidate_doctor_dashboard(appt.doctor_id)
 	return appt
 
+def _slot_key(booking):
+	doctor_id, start, holds_slot = booking
+	return (str(doctor_id), tuple(slots_of(start))) if holds_slot else None
+
 def get_appointment(db, appointment_id: str):
 	return db.query(Appointment).filter(Appointment.id == appointment_id).first()
 
@@ -28,27 +68,75 @@ def update_appointment(db, appointment_id: str, appointment: dict):
 	appt = db.query(Appointment).filter(Appointment.id == appointment_id).first()
 	if not appt:
 		return None
+	previous_doctor_id = appt.doctor_id
+	previous = (appt.doctor_id, appt.date, occupies_slot(appt.status))
 	for field, value in appointment.items():
 		setattr(appt, field, value)
-	db.commit()
+	current = (appt.doctor_id, appt.date, occupies_slot(appt.status))
+	if current[1] != previous[1]:
+		# Rows booked off the grid before it was enforced can still change status
+		try:
+			_require_slot_start(current[1])
+		except HTTPException:
+			db.rollback()
+			raise
+	moved = _slot_key(previous) != _slot_key(current)
+	if moved:
+		# Claim the new slot before giving up the old one, so a failed move changes nothing
+		if current[2] and not availability_index.reserve(db, current[0], current[1]):
+			db.rollback()
+			raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=SLOT_TAKEN_DETAIL)
+		if previous[2]:
+			availability_index.release(previous[0], previous[1])
+	try:
+		db.commit()
+	except Exception as e:
+		db.rollback()
+		if moved:
+			if current[2]:
+				availability_index.release(current[0], current[1])
+			if previous[2]:
+				availability_index.reserve(db, previous[0], previous[1], force=True)
+		_raise_if_overlap(db, e)
+		raise
 	db.refresh(appt)
+	invalidate_doctor_dashboard(previous_doctor_id, appt.doctor_id)
 	return appt
 
 def delete_appointment(db, appointment_id: str):
 	appt = db.query(Appointment).filter(Appointment.id == appointment_id).first()
 	if not appt:
 		return None
+	doctor_id = appt.doctor_id
+	start, held_slot = appt.date, occupies_slot(appt.status)
 	db.delete(appt)
 	db.commit()
+	if held_slot:
+		availability_index.release(doctor_id, start)
+	invalidate_doctor_dashboard(doctor_id)
 	return appt
 
-def list_appointments(db):
+def list_appointments(db, params: dict):
 	try:
-		return db.query(Appointment).all()
+		return paginate(
+			db.query(Appointment),
+			params,
+			sort_columns={"date": Appointment.date, "status": Appointment.status, "type": Appointment.type},
+			id_column=Appointment.id,
+			version_column=Appointment.updated_at,
+			filter_columns={
+				"patient_id": Appointment.patient_id,
+				"doctor_id": Appointment.doctor_id,
+				"status": Appointment.status,
+				"date": Appointment.date,
+			},
+		)
+	except HTTPException:
+		raise
 	except (OperationalError, ProgrammingError) as e:
 		# Catch both OperationalError and ProgrammingError (which includes UndefinedTable)
 		error_msg = str(e.orig) if hasattr(e, 'orig') else str(e)
-		print(f"Database error in list_appointments: {error_msg}")  # Debug log
+		logger.error("Database error in list_appointments: %s", error_msg)
 		if "relation" in error_msg.lower() and "does not exist" in error_msg.lower():
 			raise HTTPException(
 				status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -61,16 +149,28 @@ def list_appointments(db):
 			)
 	except SQLAlchemyError as e:
 		error_msg = str(e.orig) if hasattr(e, 'orig') else str(e)
-		print(f"SQLAlchemyError in list_appointments: {error_msg}")  # Debug log
+		logger.error("SQLAlchemyError in list_appointments: %s", error_msg)
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			detail="Failed to retrieve appointments. Please try again later."
 		)
 	except Exception as e:
-		import traceback
-		print(f"Unexpected error in list_appointments: {type(e).__name__}: {str(e)}")
-		print(traceback.format_exc())  # Debug log
+		logger.exception("Unexpected error in list_appointments")
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			detail=f"An unexpected error occurred while fetching appointments: {str(e)}"
 		)
+
+def appointments_export_statement(params: dict):
+	"""Plain column select for streaming exports: no ORM objects, ordered by primary key."""
+	statement = apply_filters(
+		select(*Appointment.__table__.columns),
+		params,
+		{
+			"patient_id": Appointment.patient_id,
+			"doctor_id": Appointment.doctor_id,
+			"status": Appointment.status,
+			"date": Appointment.date,
+		},
+	)
+	return statement.order_by(Appointment.id)
@@ -1,11 +1,31 @@
 from sqlalchemy.orm import Session
 from src.Models.usermodel import User
-from src.Utils.passwordHasher import verify_password
+from src.Utils.db import run_db
+from src.Utils.passwordHasher import verify_and_update_password_async
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
+def get_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+def get_user_version(db: Session, user_id):
+    """updated_at of a user, the row version behind profile ETags (no full row load)."""
+    row = db.query(User.updated_at).filter(User.id == user_id).first()
+    return row.updated_at if row else None
+
+def update_password_hash(db: Session, user: User, password_hash: str):
+    user.password = password_hash
+    db.commit()
+    db.refresh(user)
+    return user
+
+async def authenticate_user(db, email: str, password: str):
+    user = await run_db(db, get_user_by_email, email)
     if not user or not user.password:
         return None
-    if not verify_password(password, user.password):
+    # Argon2 runs in the hashing pool, not on the event loop or a threadpool slot
+    valid, new_hash = await verify_and_update_password_async(password, user.password)
+    if not valid:
         return None
+    if new_hash:
+        # Stored hash used outdated Argon2 parameters: upgrade it while we have the password
+        user = await run_db(db, update_password_hash, user, new_hash)
     return user
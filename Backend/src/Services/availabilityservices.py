@@ -0,0 +1,181 @@
+# Service layer for appointment slot availability
+from array import array
+from datetime import date, datetime, time as dtime, timedelta
+import os
+import threading
+import time
+
+from src.Models.appointmentmodel import Appointment, APPOINTMENT_MINUTES
+
+# A day is split into fixed slots the length of an appointment. New bookings start on
+# a slot boundary, so each fills exactly one slot and the bitmap agrees with the
+# database's overlap constraint; older rows that start between boundaries mark
+# every slot their [start, end) range overlaps.
+SLOT_MINUTES = APPOINTMENT_MINUTES
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+# Slots offered by the availability endpoint, on the same (UTC) clock as Appointment.date
+CLINIC_OPENING_TIME = os.getenv("CLINIC_OPENING_TIME", "08:00")
+CLINIC_CLOSING_TIME = os.getenv("CLINIC_CLOSING_TIME", "17:00")
+# Seconds a loaded day is trusted before it is rebuilt from the database. Writes made
+# through this worker update it immediately; other workers' writes show up after this.
+AVAILABILITY_CACHE_TTL = float(os.getenv("AVAILABILITY_CACHE_TTL", "60"))
+MAX_AVAILABILITY_DAYS = 31
+
+def occupies_slot(status) -> bool:
+	return (status or "").strip().lower() != "cancelled"
+
+def slot_of(start: datetime):
+	"""(day, slot index) an appointment starting at `start` occupies."""
+	return start.date(), (start.hour * 60 + start.minute) // SLOT_MINUTES
+
+def slots_of(start: datetime):
+	"""(day, slot index) of every slot the appointment [start, start + SLOT_MINUTES) overlaps."""
+	end = start + timedelta(minutes=SLOT_MINUTES)
+	day, index = slot_of(start)
+	slot = slot_start(day, index)
+	slots = []
+	while slot < end:
+		slots.append(slot_of(slot))
+		slot += timedelta(minutes=SLOT_MINUTES)
+	return slots
+
+def on_slot_grid(start: datetime) -> bool:
+	"""True if an appointment starting at `start` fills exactly one slot."""
+	return start.second == 0 and start.microsecond == 0 and (start.hour * 60 + start.minute) % SLOT_MINUTES == 0
+
+def slot_start(day: date, index: int) -> datetime:
+	return datetime.combine(day, dtime.min) + timedelta(minutes=index * SLOT_MINUTES)
+
+def _slot_index(clock: str) -> int:
+	hours, minutes = clock.split(":")
+	return (int(hours) * 60 + int(minutes)) // SLOT_MINUTES
+
+class AvailabilityIndex:
+	"""
+	Per-doctor, per-day busy-slot bitmaps for this worker process.
+
+	Each day is an array of booking counts, one entry per slot, built from the
+	Appointment rows with a single query and then kept current by the appointment
+	writes in this process. Checking or claiming a slot is an array lookup.
+	"""
+
+	def __init__(self):
+		self._days = {}      # (doctor_id, day) -> (loaded_at, array of counts)
+		self._versions = {}  # (doctor_id, day) -> bumped on every local write
+		self._lock = threading.Lock()
+		self._last_prune = time.monotonic()
+
+	def _stale_days(self, doctor_id: str, days, now: float):
+		return [
+			day for day in days
+			if (doctor_id, day) not in self._days or now - self._days[(doctor_id, day)][0] >= AVAILABILITY_CACHE_TTL
+		]
+
+	def _prune(self, now: float):
+		if now - self._last_prune < AVAILABILITY_CACHE_TTL:
+			return
+		self._last_prune = now
+		for key in [key for key, (loaded_at, _) in self._days.items() if now - loaded_at >= AVAILABILITY_CACHE_TTL]:
+			del self._days[key]
+		# Versions of past days can no longer race with a load
+		today = datetime.utcnow().date()
+		for key in [key for key in self._versions if key[1] < today]:
+			del self._versions[key]
+
+	def _ensure_loaded(self, db, doctor_id: str, days) -> dict:
+		"""{day: slot counts} for the given days, loading the missing or stale ones.
+
+		The arrays are captured under the lock and returned: a later _prune may drop
+		them from the index before the caller reads them.
+		"""
+		for attempt in range(3):
+			now = time.monotonic()
+			with self._lock:
+				self._prune(now)
+				missing = self._stale_days(doctor_id, days, now)
+				versions = {day: self._versions.get((doctor_id, day), 0) for day in missing}
+				loaded = {day: self._days[(doctor_id, day)][1] for day in days if day not in missing}
+			if not missing:
+				return loaded
+			rows = db.query(Appointment.date, Appointment.status).filter(
+				Appointment.doctor_id == doctor_id,
+				# Includes the previous evening's bookings that run past midnight
+				Appointment.date > datetime.combine(min(missing), dtime.min) - timedelta(minutes=SLOT_MINUTES),
+				Appointment.date < datetime.combine(max(missing) + timedelta(days=1), dtime.min),
+			).all()
+			built = {day: array("H", [0]) * SLOTS_PER_DAY for day in missing}
+			for start, status in rows:
+				if not occupies_slot(status):
+					continue
+				for day, index in slots_of(start):
+					if day in built:
+						built[day][index] += 1
+			with self._lock:
+				raced = False
+				for day in missing:
+					key = (doctor_id, day)
+					# A local write landed while we were querying: our rows may predate it
+					if self._versions.get(key, 0) != versions[day] and attempt < 2:
+						raced = True
+						continue
+					self._days[key] = (now, built[day])
+					loaded[day] = built[day]
+			if not raced:
+				return loaded
+
+	def busy_slots(self, db, doctor_id, days) -> dict:
+		"""{day: set of busy slot indexes} for the given days."""
+		doctor_id = str(doctor_id)
+		counts = self._ensure_loaded(db, doctor_id, days)
+		with self._lock:
+			return {day: {index for index, count in enumerate(counts[day]) if count} for day in days}
+
+	def reserve(self, db, doctor_id, start: datetime, force: bool = False) -> bool:
+		"""Claim the slots an appointment at `start` overlaps; False if one is already taken (unless forced)."""
+		doctor_id = str(doctor_id)
+		slots = slots_of(start)
+		counts = self._ensure_loaded(db, doctor_id, sorted({day for day, _ in slots}))
+		with self._lock:
+			if not force and any(counts[day][index] for day, index in slots):
+				return False
+			for day, index in slots:
+				key = (doctor_id, day)
+				counts[day][index] += 1
+				self._versions[key] = self._versions.get(key, 0) + 1
+			return True
+
+	def release(self, doctor_id, start: datetime):
+		doctor_id = str(doctor_id)
+		with self._lock:
+			for day, index in slots_of(start):
+				key = (doctor_id, day)
+				self._versions[key] = self._versions.get(key, 0) + 1
+				entry = self._days.get(key)
+				if entry is not None and entry[1][index]:
+					entry[1][index] -= 1
+
+availability_index = AvailabilityIndex()
+
+def get_doctor_availability(db, doctor_id, date_from: date, date_to: date):
+	"""Free and busy slot start times per day in [date_from, date_to)."""
+	days = [date_from + timedelta(days=offset) for offset in range((date_to - date_from).days)]
+	busy = availability_index.busy_slots(db, doctor_id, days)
+	opening, closing = _slot_index(CLINIC_OPENING_TIME), _slot_index(CLINIC_CLOSING_TIME)
+	now = datetime.utcnow()
+	result = []
+	for day in days:
+		free = [
+			slot_start(day, index).isoformat()
+			for index in range(opening, closing)
+			if index not in busy[day] and slot_start(day, index) >= now
+		]
+		result.append({
+			"date": day.isoformat(),
+			"free": free,
+			"busy": [slot_start(day, index).isoformat() for index in sorted(busy[day])],
+		})
+	return {
+		"doctor_id": str(doctor_id),
+		"slot_minutes": SLOT_MINUTES,
+		"days": result,
+	}
@@ -1,7 +1,19 @@
 
 from src.Models.billingmodel import Billing
+from src.Models.appointmentmodel import Appointment
 from uuid import uuid4
 from datetime import datetime
+from sqlalchemy import select
+from src.Utils.pagination import paginate, apply_filters
+from src.Services.dashboard import invalidate_doctor_dashboard
+
+def _invalidate_billing_doctors(db, *appointment_ids):
+	"""Bills only reach a doctor's dashboard (earnings) through their appointment."""
+	appointment_ids = [appointment_id for appointment_id in appointment_ids if appointment_id]
+	if not appointment_ids:
+		return
+	doctor_ids = db.query(Appointment.doctor_id).filter(Appointment.id.in_(appointment_ids)).all()
+	invalidate_doctor_dashboard(*(doctor_id for (doctor_id,) in doctor_ids))
 
 def create_billing(db, billing: dict):
 	bill = Billing(
@@ -16,6 +28,7 @@ def create_billing(db, billing: dict):
 	db.add(bill)
 	db.commit()
 	db.refresh(bill)
+	_invalidate_billing_doctors(db, bill.appointment_id)
 	return bill
 
 def get_billing(db, billing_id: str):
@@ -25,19 +38,39 @@ def update_billing(db, billing_id: str, billing: dict):
 	bill = db.query(Billing).filter(Billing.id == billing_id).first()
 	if not bill:
 		return None
+	previous_appointment_id = bill.appointment_id
 	for field, value in billing.items():
 		setattr(bill, field, value)
 	db.commit()
 	db.refresh(bill)
+	_invalidate_billing_doctors(db, previous_appointment_id, bill.appointment_id)
 	return bill
 
 def delete_billing(db, billing_id: str):
 	bill = db.query(Billing).filter(Billing.id == billing_id).first()
 	if not bill:
 		return None
+	appointment_id = bill.appointment_id
 	db.delete(bill)
 	db.commit()
+	_invalidate_billing_doctors(db, appointment_id)
 	return bill
 
-def list_billings(db):
-	return db.query(Billing).all()
+def list_billings(db, params: dict):
+	return paginate(
+		db.query(Billing),
+		params,
+		sort_columns={"date": Billing.date, "amount": Billing.amount, "status": Billing.status},
+		id_column=Billing.id,
+		version_column=Billing.updated_at,
+		filter_columns={"patient_id": Billing.patient_id, "status": Billing.status, "date": Billing.date},
+	)
+
+def billings_export_statement(params: dict):
+	"""Plain column select for streaming exports: no ORM objects, ordered by primary key."""
+	statement = apply_filters(
+		select(*Billing.__table__.columns),
+		params,
+		{"patient_id": Billing.patient_id, "status": Billing.status, "date": Billing.date},
+	)
+	return statement.order_by(Billing.id)
@@ -4,71 +4,109 @@ from ..Models.usermodel import User, UserRole
 from ..Models.appointmentmodel import Appointment
 from ..Models.prescriptionmodel import Prescription
 from ..Models.billingmodel import Billing
+from ..Utils.cache import TTLCache
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import date, datetime
+from sqlalchemy import func, select
+from datetime import date, datetime, time, timedelta
+from uuid import UUID
+import os
+
+# Seconds a doctor's dashboard figures are served from memory (0 disables the cache)
+DOCTOR_DASHBOARD_CACHE_TTL = float(os.getenv("DOCTOR_DASHBOARD_CACHE_TTL", "30"))
+doctor_dashboard_cache = TTLCache(ttl=DOCTOR_DASHBOARD_CACHE_TTL)
+
+def _today_range():
+    """[start, end) of the current day, so "today" filters stay sargable on the date indexes."""
+    start = datetime.combine(datetime.now().date(), time.min)
+    return start, start + timedelta(days=1)
 
 def get_admin_dashboard_data(db: Session):
-    total_doctors = db.query(User).filter(User.role == UserRole.DOCTOR).count()
-    total_patients = db.query(User).filter(User.role == UserRole.PATIENT).count()
-    today = datetime.now().date()
-    appointments_today = db.query(Appointment).filter(
-        func.date(Appointment.date) == today
-    ).count()
+    """
+    Clinic-wide counters for the admin dashboard, in one round trip.
+    """
+    day_start, day_end = _today_range()
+    total_doctors = select(func.count()).select_from(User).where(
+        User.role == UserRole.DOCTOR
+    ).scalar_subquery()
+    total_patients = select(func.count()).select_from(User).where(
+        User.role == UserRole.PATIENT
+    ).scalar_subquery()
+    appointments_today = select(func.count()).select_from(Appointment).where(
+        Appointment.date >= day_start,
+        Appointment.date < day_end
+    ).scalar_subquery()
+    row = db.execute(select(
+        total_doctors.label("total_doctors"),
+        total_patients.label("total_patients"),
+        appointments_today.label("appointments_today"),
+    )).one()
     return {
-        'total_doctors': total_doctors,
-        'total_patients': total_patients,
-        'appointments_today': appointments_today
+        'total_doctors': row.total_doctors or 0,
+        'total_patients': row.total_patients or 0,
+        'appointments_today': row.appointments_today or 0
     }
 
 def get_doctor_dashboard_data(db: Session, doctor_id: str):
     """
     Get analytics data for a specific doctor's dashboard.
+
+    All four figures come from a single statement; results are cached per doctor
+    for DOCTOR_DASHBOARD_CACHE_TTL seconds (see invalidate_doctor_dashboard).
     """
-    from uuid import UUID
-    
     # Convert doctor_id to UUID if it's a string
     try:
         doctor_uuid = UUID(doctor_id) if isinstance(doctor_id, str) else doctor_id
-    except:
+    except ValueError:
         doctor_uuid = doctor_id
-    
+
+    cached = doctor_dashboard_cache.get(str(doctor_uuid))
+    if cached is not None:
+        return dict(cached)
+
+    day_start, day_end = _today_range()
+
     # Total unique patients (patients who have appointments with this doctor)
-    total_patients = db.query(func.count(func.distinct(Appointment.patient_id))).filter(
+    total_patients = select(func.count(func.distinct(Appointment.patient_id))).where(
         Appointment.doctor_id == doctor_uuid
-    ).scalar() or 0
-    
+    ).scalar_subquery()
+
     # Appointments today
-    today = datetime.now().date()
-    appointments_today = db.query(Appointment).filter(
+    appointments_today = select(func.count()).select_from(Appointment).where(
         Appointment.doctor_id == doctor_uuid,
-        func.date(Appointment.date) == today
-    ).count()
-    
+        Appointment.date >= day_start,
+        Appointment.date < day_end
+    ).scalar_subquery()
+
     # Pending reports (Active prescriptions for this doctor)
-    pending_reports = db.query(Prescription).filter(
+    pending_reports = select(func.count()).select_from(Prescription).where(
         Prescription.doctor_id == doctor_uuid,
         Prescription.status == "Active"
-    ).count()
-    
+    ).scalar_subquery()
+
     # Total earnings (sum of paid billing amounts for appointments with this doctor)
-    # Get all appointment IDs for this doctor
-    doctor_appointment_ids = [appt_id[0] for appt_id in db.query(Appointment.id).filter(
-        Appointment.doctor_id == doctor_uuid
-    ).all()]
-    
-    # Calculate total earnings from paid bills linked to these appointments
-    if doctor_appointment_ids:
-        total_earnings = db.query(func.coalesce(func.sum(Billing.amount), 0)).filter(
-            Billing.appointment_id.in_(doctor_appointment_ids),
-            Billing.status == "Paid"
-        ).scalar() or 0
-    else:
-        total_earnings = 0
-    
-    return {
-        'total_patients': total_patients,
-        'appointments_today': appointments_today,
-        'pending_reports': pending_reports,
-        'total_earnings': float(total_earnings)
+    total_earnings = select(func.coalesce(func.sum(Billing.amount), 0)).join(
+        Appointment, Appointment.id == Billing.appointment_id
+    ).where(
+        Appointment.doctor_id == doctor_uuid,
+        Billing.status == "Paid"
+    ).scalar_subquery()
+
+    row = db.execute(select(
+        total_patients.label("total_patients"),
+        appointments_today.label("appointments_today"),
+        pending_reports.label("pending_reports"),
+        total_earnings.label("total_earnings"),
+    )).one()
+
+    data = {
+        'total_patients': row.total_patients or 0,
+        'appointments_today': row.appointments_today or 0,
+        'pending_reports': row.pending_reports or 0,
+        'total_earnings': float(row.total_earnings or 0)
     }
+    doctor_dashboard_cache.set(str(doctor_uuid), data)
+    return dict(data)
+
+def invalidate_doctor_dashboard(*doctor_ids):
+    """Drop cached dashboard figures after a write touching these doctors' data."""
+    doctor_dashboard_cache.invalidate(*(str(doctor_id) for doctor_id in doctor_ids if doctor_id))
@@ -0,0 +1,149 @@
+# Cached doctor directory (GET /api/patient/doctors and /api/admin/doctors).
+#
+# The doctor rows change rarely, so every worker keeps the pages it has served in
+# memory until a doctor is created, edited or deleted. With REDIS_URL set the pages
+# are also shared between workers under a version key: a write bumps the version,
+# which the other workers pick up within DOCTOR_DIRECTORY_REFRESH_SECONDS (the
+# writing worker drops its copy immediately). Without Redis the other workers never
+# hear of a write, so pages are only kept DOCTOR_DIRECTORY_LOCAL_TTL seconds.
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from src.Utils.cache import LRUCache
+from src.Utils.jwtGenerator import redis_client
+from src.Utils.pagination import Page
+
+logger = logging.getLogger(__name__)
+
+# Seconds a directory page is kept (0 disables the cache)
+DOCTOR_DIRECTORY_CACHE_TTL = float(os.getenv("DOCTOR_DIRECTORY_CACHE_TTL", "3600"))
+# Distinct pages (sort / filter / cursor combinations) kept per worker
+DOCTOR_DIRECTORY_CACHE_SIZE = int(os.getenv("DOCTOR_DIRECTORY_CACHE_SIZE", "256"))
+# How often each worker publishes its own invalidations and checks for the others'
+DOCTOR_DIRECTORY_REFRESH_SECONDS = float(os.getenv("DOCTOR_DIRECTORY_REFRESH_SECONDS", "5"))
+# Seconds a page is kept without REDIS_URL: how long another worker may serve it after a write
+DOCTOR_DIRECTORY_LOCAL_TTL = float(os.getenv("DOCTOR_DIRECTORY_LOCAL_TTL", "5"))
+
+# Lifetime of a page in this worker's memory
+_PAGE_TTL = DOCTOR_DIRECTORY_CACHE_TTL if redis_client is not None else min(DOCTOR_DIRECTORY_CACHE_TTL, DOCTOR_DIRECTORY_LOCAL_TTL)
+
+DIRECTORY_VERSION_KEY = "directory:doctors:version"
+DIRECTORY_PAGE_KEY = "directory:doctors:{version}:{key}"
+
+_pages = LRUCache(maxsize=DOCTOR_DIRECTORY_CACHE_SIZE)
+# generation: bumped on every local invalidation, so a rebuild that started before
+# it is not stored. shared_version: last version seen in Redis. pending_bumps:
+# invalidations made here and not yet published to Redis.
+_state = {"generation": 0, "shared_version": None, "pending_bumps": 0}
+_state_lock = threading.Lock()
+# (generation, page key) -> task building that page; concurrent misses await the same one
+_inflight = {}
+
+def _page_key(params: dict) -> str:
+	raw = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+	return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+def _encode_page(page: Page) -> str:
+	return json.dumps([page.items, page.next_cursor, page.etag], separators=(",", ":"))
+
+def _decode_page(raw: str) -> Page:
+	items, next_cursor, etag = json.loads(raw)
+	return Page(items, next_cursor, etag)
+
+def invalidate_doctor_directory():
+	"""Drop the cached directory after a write to a doctor's row (call after commit)."""
+	with _state_lock:
+		_state["generation"] += 1
+		if redis_client is not None:
+			_state["pending_bumps"] += 1
+	_pages.clear()
+
+async def _load_page(key: str, build, generation: int, version):
+	page = None
+	shared_key = DIRECTORY_PAGE_KEY.format(version=version, key=key)
+	if version is not None:
+		try:
+			raw = await redis_client.get(shared_key)
+			page = _decode_page(raw) if raw else None
+		except Exception as e:
+			logger.warning("Doctor directory read from Redis failed: %s: %s", type(e).__name__, e)
+	if page is None:
+		page = await build()
+		if version is not None:
+			try:
+				await redis_client.set(shared_key, _encode_page(page), ex=int(DOCTOR_DIRECTORY_CACHE_TTL))
+			except Exception as e:
+				logger.warning("Doctor directory write to Redis failed: %s: %s", type(e).__name__, e)
+	with _state_lock:
+		current = _state["generation"] == generation
+	if current:
+		_pages.set(key, page, expires_at=time.time() + _PAGE_TTL)
+	return page
+
+async def get_doctor_directory(params: dict, build) -> Page:
+	"""
+	Directory page for list_params() `params`. On a miss `build()` (an awaitable
+	returning the Page) runs once, however many requests are waiting for the page.
+	"""
+	if _PAGE_TTL <= 0:
+		return await build()
+	key = _page_key(params)
+	page = _pages.get(key)
+	if page is not None:
+		return page
+	with _state_lock:
+		generation = _state["generation"]
+		# Until this worker's invalidations reach Redis the shared copy may be stale
+		version = _state["shared_version"] if not _state["pending_bumps"] else None
+	flight_key = (generation, key)
+	task = _inflight.get(flight_key)
+	if task is None:
+		task = asyncio.ensure_future(_load_page(key, build, generation, version))
+		_inflight[flight_key] = task
+		task.add_done_callback(lambda _: _inflight.pop(flight_key, None))
+	# Shielded so one caller going away does not cancel the build for the others
+	return await asyncio.shield(task)
+
+async def sync_doctor_directory():
+	"""Publish this worker's invalidations to Redis and pick up the other workers'."""
+	with _state_lock:
+		pending = _state["pending_bumps"]
+	if pending:
+		version = await redis_client.incr(DIRECTORY_VERSION_KEY)
+	else:
+		version = await redis_client.get(DIRECTORY_VERSION_KEY) or 0
+	with _state_lock:
+		_state["pending_bumps"] -= pending
+		changed = str(version) != _state["shared_version"]
+		if changed:
+			_state["shared_version"] = str(version)
+			_state["generation"] += 1
+	if changed:
+		_pages.clear()
+
+async def doctor_directory_refresher():
+	"""Background loop started with the app; only needed when the directory is shared through Redis."""
+	if redis_client is None or DOCTOR_DIRECTORY_CACHE_TTL <= 0:
+		return
+	while True:
+		try:
+			await sync_doctor_directory()
+		except Exception as e:
+			# Keep serving this worker's pages; the shared tier stays off until Redis answers
+			logger.warning("Doctor directory sync failed: %s: %s", type(e).__name__, e)
+		await asyncio.sleep(DOCTOR_DIRECTORY_REFRESH_SECONDS)
+
+def get_directory_stats() -> dict:
+	stats = _pages.stats()
+	with _state_lock:
+		stats["generation"] = _state["generation"]
+		stats["shared_version"] = _state["shared_version"]
+		stats["pending_invalidations"] = _state["pending_bumps"]
+	stats["shared"] = redis_client is not None
+	stats["ttl_seconds"] = _PAGE_TTL
+	stats["building"] = len(_inflight)
+	return stats
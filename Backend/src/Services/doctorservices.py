@@ -3,16 +3,17 @@ from sqlalchemy.orm import Session
 from src.Models.usermodel import User, UserRole
 from src.Middlewares.userpydanticmodel import UserRegister, UserEdit
 from src.Utils.passwordHasher import hash_password
+from src.Services.directoryservices import invalidate_doctor_directory
 from uuid import uuid4
 
-def create_user_doctor(db: Session, user: UserRegister):
+def create_user_doctor(db: Session, user: UserRegister, password_hash: str = None):
 	db_user = User(
 		id=uuid4(),
 		name=user.name,
 		email=user.email,
 		phone=user.phone,
 		address=user.address,
-		password=hash_password(user.password),
+		password=password_hash or hash_password(user.password),
 		role=UserRole.DOCTOR,
 		profile_image=user.profile_image,
 		specialization=user.specialization,
@@ -20,6 +21,7 @@ def create_user_doctor(db: Session, user: UserRegister):
 	)
 	db.add(db_user)
 	db.commit()
+	invalidate_doctor_directory()
 	db.refresh(db_user)
 	return db_user
 
@@ -33,6 +35,7 @@ def update_user_doctor(db: Session, user_id, user: UserEdit):
 	for field, value in user.dict(exclude_unset=True).items():
 		setattr(db_user, field, value)
 	db.commit()
+	invalidate_doctor_directory()
 	db.refresh(db_user)
 	return db_user
 
@@ -42,4 +45,5 @@ def delete_user_doctor(db: Session, user_id):
 		return None
 	db.delete(db_user)
 	db.commit()
+	invalidate_doctor_directory()
 	return db_user
@@ -2,6 +2,7 @@
 from src.Models.medicalrecordmodel import MedicalRecord
 from uuid import uuid4
 from datetime import datetime
+from src.Utils.pagination import paginate
 
 def create_medicalrecord(db, record: dict):
 	rec = MedicalRecord(
@@ -39,5 +40,16 @@ def delete_medicalrecord(db, record_id: str):
 	db.commit()
 	return rec
 
-def list_medicalrecords(db):
-	return db.query(MedicalRecord).all()
+def list_medicalrecords(db, params: dict):
+	return paginate(
+		db.query(MedicalRecord),
+		params,
+		sort_columns={"date": MedicalRecord.date, "type": MedicalRecord.type, "title": MedicalRecord.title},
+		id_column=MedicalRecord.id,
+		version_column=MedicalRecord.updated_at,
+		filter_columns={
+			"patient_id": MedicalRecord.patient_id,
+			"doctor_id": MedicalRecord.doctor_id,
+			"date": MedicalRecord.date,
+		},
+	)
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
-from src.Models.usermodel import User
+from src.Models.usermodel import User, UserRole
 from src.Middlewares.userpydanticmodel import UserOAuthRegister
+from src.Services.directoryservices import invalidate_doctor_directory
 from uuid import uuid4
 
 def oauth_account_link_or_create(db: Session, oauth_data: UserOAuthRegister, provider: str, provider_id: str):
@@ -24,9 +25,12 @@ def oauth_account_link_or_create(db: Session, oauth_data: UserOAuthRegister, pro
                 user.name = oauth_data.name
             if oauth_data.profile_image:
                 user.profile_image = oauth_data.profile_image
+            was_doctor = user.role == UserRole.DOCTOR
             if oauth_data.role:
                 user.role = oauth_data.role
             db.commit()
+            if was_doctor or user.role == UserRole.DOCTOR:
+                invalidate_doctor_directory()
             db.refresh(user)
         return user
     # Create new user with OAuth info
@@ -41,5 +45,7 @@ def oauth_account_link_or_create(db: Session, oauth_data: UserOAuthRegister, pro
     )
     db.add(new_user)
     db.commit()
+    if new_user.role == UserRole.DOCTOR:
+        invalidate_doctor_directory()
     db.refresh(new_user)
     return new_user
@@ -5,14 +5,14 @@ from src.Middlewares.userpydanticmodel import UserRegister, UserEdit
 from src.Utils.passwordHasher import hash_password
 from uuid import uuid4
 
-def create_user_patient(db: Session, user: UserRegister):
+def create_user_patient(db: Session, user: UserRegister, password_hash: str = None):
 	db_user = User(
 		id=uuid4(),
 		name=user.name,
 		email=user.email,
 		phone=user.phone,
 		address=user.address,
-		password=hash_password(user.password),
+		password=password_hash or hash_password(user.password),
 		role=UserRole.PATIENT,
 		profile_image=user.profile_image
 	)
@@ -2,6 +2,8 @@
 from src.Models.prescriptionmodel import Prescription
 from uuid import uuid4
 from datetime import datetime
+from src.Utils.pagination import paginate
+from src.Services.dashboard import invalidate_doctor_dashboard
 
 def create_prescription(db, prescription: dict):
 	presc = Prescription(
@@ -18,6 +20,7 @@ def create_prescription(db, prescription: dict):
 	db.add(presc)
 	db.commit()
 	db.refresh(presc)
+	invalidate_doctor_dashboard(presc.doctor_id)
 	return presc
 
 def get_prescription(db, prescription_id: str):
@@ -27,19 +30,35 @@ def update_prescription(db, prescription_id: str, prescription: dict):
 	presc = db.query(Prescription).filter(Prescription.id == prescription_id).first()
 	if not presc:
 		return None
+	previous_doctor_id = presc.doctor_id
 	for field, value in prescription.items():
 		setattr(presc, field, value)
 	db.commit()
 	db.refresh(presc)
+	invalidate_doctor_dashboard(previous_doctor_id, presc.doctor_id)
 	return presc
 
 def delete_prescription(db, prescription_id: str):
 	presc = db.query(Prescription).filter(Prescription.id == prescription_id).first()
 	if not presc:
 		return None
+	doctor_id = presc.doctor_id
 	db.delete(presc)
 	db.commit()
+	invalidate_doctor_dashboard(doctor_id)
 	return presc
 
-def list_prescriptions(db):
-	return db.query(Prescription).all()
+def list_prescriptions(db, params: dict):
+	return paginate(
+		db.query(Prescription),
+		params,
+		sort_columns={"date": Prescription.date, "status": Prescription.status, "medication": Prescription.medication},
+		id_column=Prescription.id,
+		version_column=Prescription.updated_at,
+		filter_columns={
+			"patient_id": Prescription.patient_id,
+			"doctor_id": Prescription.doctor_id,
+			"status": Prescription.status,
+			"date": Prescription.date,
+		},
+	)
@@ -0,0 +1,77 @@
+# Readiness check behind GET /readyz.
+#
+# Orchestrators and load balancers probe every few seconds per container, so the
+# database part of the check is cached for READINESS_CHECK_TTL seconds (failures
+# too) and concurrent probes share one query: probes never add load to Postgres.
+import asyncio
+import logging
+import os
+import time
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from starlette.concurrency import run_in_threadpool
+from src.Utils.db import run_in_session
+
+logger = logging.getLogger(__name__)
+
+# Seconds a database check result is reused
+READINESS_CHECK_TTL = float(os.getenv("READINESS_CHECK_TTL", "5"))
+# Seconds the database may take to answer before the probe reports not ready
+READINESS_CHECK_TIMEOUT = float(os.getenv("READINESS_CHECK_TIMEOUT", "2"))
+# Also require the database to be migrated to the revision(s) this build ships
+READINESS_CHECK_MIGRATIONS = os.getenv("READINESS_CHECK_MIGRATIONS", "true").strip().lower() in ("1", "true", "yes", "on")
+
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "../../alembic.ini")
+
+_migration_heads = None
+_last_check = {"result": None, "checked_at": 0.0}
+_inflight = {"task": None}
+
+def migration_heads() -> set:
+	"""Revisions alembic/versions ends at (read once, the files do not change at runtime)."""
+	global _migration_heads
+	if _migration_heads is None:
+		# alembic is only needed here, so it is not imported with the app
+		from alembic.config import Config
+		from alembic.script import ScriptDirectory
+		_migration_heads = set(ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_heads())
+	return _migration_heads
+
+def _applied_revisions(db) -> set:
+	if not READINESS_CHECK_MIGRATIONS:
+		db.execute(text("SELECT 1"))
+		return set()
+	try:
+		return set(db.execute(text("SELECT version_num FROM alembic_version")).scalars())
+	except ProgrammingError:
+		# No alembic_version table: the database answers but was never migrated
+		return set()
+
+async def _check_database() -> dict:
+	result = {"ok": True, "database": "ok", "migrations": "skipped"}
+	try:
+		heads = await run_in_threadpool(migration_heads) if READINESS_CHECK_MIGRATIONS else set()
+		applied = await asyncio.wait_for(run_in_session(_applied_revisions), READINESS_CHECK_TIMEOUT)
+	except Exception as e:
+		logger.warning("Readiness check failed: %s: %s", type(e).__name__, e)
+		# Only the error type: the probe is unauthenticated
+		result.update(ok=False, database=f"error: {type(e).__name__}")
+	else:
+		if READINESS_CHECK_MIGRATIONS:
+			current = applied == heads
+			result["migrations"] = "ok" if current else "pending"
+			result["ok"] = current
+	_last_check["result"] = result
+	_last_check["checked_at"] = time.monotonic()
+	return result
+
+async def database_status() -> dict:
+	"""Database reachable and migrated, from a check at most READINESS_CHECK_TTL seconds old."""
+	if _last_check["result"] is not None and time.monotonic() - _last_check["checked_at"] < READINESS_CHECK_TTL:
+		return _last_check["result"]
+	task = _inflight["task"]
+	if task is None:
+		task = _inflight["task"] = asyncio.ensure_future(_check_database())
+		task.add_done_callback(lambda _: _inflight.update(task=None))
+	# Shielded so one probe timing out does not cancel the check for the others
+	return await asyncio.shield(task)
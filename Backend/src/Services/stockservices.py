@@ -1,8 +1,12 @@
 
+import logging
 from src.Models.stockmodel import StockItem
 from uuid import uuid4
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, OperationalError
 from fastapi import HTTPException, status
+from src.Utils.pagination import paginate
+
+logger = logging.getLogger(__name__)
 
 def create_stock_item(db, item: dict):
 	from datetime import datetime
@@ -48,11 +52,10 @@ def create_stock_item(db, item: dict):
 			description=item.get("description"),
 			min_stock_level=item.get("min_stock_level", 0)
 		)
-		print(f"Creating stock item: {item.get('name')}")  # Debug log
 		db.add(stock)
 		db.commit()
 		db.refresh(stock)
-		print(f"Stock item created successfully: {stock.id}")  # Debug log
+		logger.debug("Stock item created: %s", stock.id)
 		return stock
 	except HTTPException:
 		raise
@@ -60,7 +63,7 @@ def create_stock_item(db, item: dict):
 		# Catch OperationalError FIRST (before SQLAlchemyError) since it's more specific
 		db.rollback()
 		error_msg = str(e.orig) if hasattr(e, 'orig') else str(e)
-		print(f"OperationalError caught: {error_msg}")  # Debug log
+		logger.error("OperationalError creating stock item: %s", error_msg)
 		if "column" in error_msg.lower() and "does not exist" in error_msg.lower():
 			# Extract column name from error
 			missing_col = ""
@@ -88,7 +91,7 @@ def create_stock_item(db, item: dict):
 		# Catch IntegrityError before SQLAlchemyError
 		db.rollback()
 		error_msg = str(e.orig) if hasattr(e, 'orig') else str(e)
-		print(f"IntegrityError caught: {error_msg}")  # Debug log
+		logger.warning("IntegrityError creating stock item: %s", error_msg)
 		if "duplicate" in error_msg.lower() or "unique" in error_msg.lower():
 			raise HTTPException(
 				status_code=status.HTTP_400_BAD_REQUEST,
@@ -108,7 +111,7 @@ def create_stock_item(db, item: dict):
 		# Catch other SQLAlchemy errors last
 		db.rollback()
 		error_msg = str(e.orig) if hasattr(e, 'orig') else str(e)
-		print(f"SQLAlchemyError caught: {error_msg}")  # Debug log
+		logger.error("SQLAlchemyError creating stock item: %s", error_msg)
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			detail=f"Database error: {error_msg}. Please check your data and try again."
@@ -217,9 +220,24 @@ def delete_stock_item(db, item_id: str):
 			detail=f"An unexpected error occurred: {str(e)}"
 		)
 
-def list_stock_items(db):
+def list_stock_items(db, params: dict):
 	try:
-		return db.query(StockItem).all()
+		return paginate(
+			db.query(StockItem),
+			params,
+			sort_columns={
+				"name": StockItem.name,
+				"quantity": StockItem.quantity,
+				"expiry_date": StockItem.expiry_date,
+				"category": StockItem.category,
+			},
+			id_column=StockItem.id,
+			version_column=StockItem.updated_at,
+			default_sort="name",
+			default_order="asc",
+		)
+	except HTTPException:
+		raise
 	except OperationalError as e:
 		error_msg = str(e.orig) if hasattr(e, 'orig') else str(e)
 		if "column" in error_msg.lower() and "does not exist" in error_msg.lower():
@@ -0,0 +1,66 @@
+# Service layer for the patient timeline: one feed over appointments, prescriptions,
+# medical records and bills
+from sqlalchemy import Float, String, cast, literal, null, select, union_all
+from src.Models.appointmentmodel import Appointment
+from src.Models.billingmodel import Billing
+from src.Models.medicalrecordmodel import MedicalRecord
+from src.Models.prescriptionmodel import Prescription
+from src.Models.usermodel import User
+from src.Utils.pagination import paginate
+
+def _entry(kind: str, id_column, date_column, doctor_id, title, status, details, amount):
+	return select(
+		literal(kind, String).label("kind"),
+		id_column.label("id"),
+		date_column.label("date"),
+		doctor_id.label("doctor_id"),
+		title.label("title"),
+		status.label("status"),
+		details.label("details"),
+		amount.label("amount"),
+	)
+
+def _timeline(patient_id):
+	"""
+	UNION ALL of the patient's rows in every table, each branch restricted by the
+	(patient_id, date) index of its table. Rows without a date have no place in
+	the feed and are left out, which also keeps the date column NOT NULL for
+	keyset paging.
+	"""
+	no_text, no_amount = cast(null(), String), cast(null(), Float)
+	appointments = _entry(
+		"appointment", Appointment.id, Appointment.date, Appointment.doctor_id,
+		Appointment.type, Appointment.status, Appointment.notes, no_amount,
+	).where(Appointment.patient_id == patient_id)
+	prescriptions = _entry(
+		"prescription", Prescription.id, Prescription.date, Prescription.doctor_id,
+		Prescription.medication, Prescription.status, Prescription.dosage + ", " + Prescription.duration, no_amount,
+	).where(Prescription.patient_id == patient_id, Prescription.date.isnot(None))
+	records = _entry(
+		"medical_record", MedicalRecord.id, MedicalRecord.date, MedicalRecord.doctor_id,
+		MedicalRecord.title, no_text, MedicalRecord.details, no_amount,
+	).where(MedicalRecord.patient_id == patient_id, MedicalRecord.date.isnot(None))
+	# A bill reaches a doctor only through its appointment
+	billings = _entry(
+		"billing", Billing.id, Billing.date, Appointment.doctor_id,
+		Billing.description, Billing.status, no_text, Billing.amount,
+	).select_from(Billing).outerjoin(Appointment, Billing.appointment_id == Appointment.id).where(
+		Billing.patient_id == patient_id, Billing.date.isnot(None)
+	)
+	return union_all(appointments, prescriptions, records, billings).subquery("timeline")
+
+def list_patient_timeline(db, patient_id, params: dict):
+	timeline = _timeline(patient_id)
+	# Doctor names come from the same statement
+	query = db.query(
+		timeline,
+		User.name.label("doctor_name"),
+		User.specialization.label("doctor_specialization"),
+	).outerjoin(User, User.id == timeline.c.doctor_id)
+	return paginate(
+		query,
+		params,
+		sort_columns={"date": timeline.c.date},
+		id_column=timeline.c.id,
+		filter_columns={"doctor_id": timeline.c.doctor_id, "status": timeline.c.status, "date": timeline.c.date},
+	)
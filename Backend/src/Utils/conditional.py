@@ -0,0 +1,48 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Cache-Control per kind of route. Per-user data is only cached by the browser and
+# revalidated on every use (If-None-Match -> 304); the doctor directory is the same
+# for everyone and changes rarely, so it may be reused for a short while.
+PROFILE_CACHE_CONTROL = "private, no-cache"
+LIST_CACHE_CONTROL = "private, no-cache"
+DIRECTORY_CACHE_CONTROL = "private, max-age=30"
+
+def weak_etag(*parts) -> str:
+    """Weak ETag over the given row versions (ids, updated_at values, cursors...)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\x1f")
+    return f'W/"{digest.hexdigest()}"'
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison: W/"x" matches "x"
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+def conditional_response(
+    request: Optional[Request],
+    response: Response,
+    etag: str,
+    cache_control: str,
+) -> Optional[Response]:
+    """
+    Put ETag/Cache-Control on the response; if the client already holds this
+    version, return the 304 to send instead (the caller then skips serializing).
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Vary"] = "Authorization"
+    if request is None or not _etag_matches(request, etag):
+        return None
+    # Headers the 200 would have carried, so the client can refresh its cached copy
+    headers = {name: value for name, value in response.headers.items() if name.lower() != "content-length"}
+    return Response(status_code=304, headers=headers)
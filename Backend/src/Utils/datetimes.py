@@ -0,0 +1,16 @@
+from datetime import datetime
+
+def coerce_datetime(value):
+    """
+    Accept ISO-8601 strings for DateTime columns.
+
+    psycopg2 lets Postgres parse strings itself, but asyncpg only binds real datetime
+    objects, so request payloads are converted before they reach the driver. The
+    columns are TIMESTAMP WITHOUT TIME ZONE, so any offset is dropped the same way
+    Postgres drops it when casting the string.
+    """
+    if isinstance(value, str) and value:
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
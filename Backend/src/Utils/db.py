@@ -1,18 +1,225 @@
-
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 import os
+import threading
+import time
+from src.Utils.slowqueries import SlowQueryLog
 
 load_dotenv(os.path.join(os.path.dirname(__file__), '../../.env'))
-DATABASE_URL = os.getenv("DATABASE_URL").replace("+asyncpg", "+psycopg2")
+RAW_DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = RAW_DATABASE_URL.replace("+asyncpg", "+psycopg2")
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+# DB_ASYNC=true serves the async routes from an AsyncEngine (asyncpg) instead of
+# handing every request to Starlette's threadpool with a psycopg2 session.
+DB_ASYNC = _env_flag("DB_ASYNC", "false")
+
+# Pool settings for the app engines (scripts/seed_admin.py uses the same defaults)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))
+DB_POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", "true")
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+# Open DB_POOL_SIZE connections at startup, before the app accepts traffic
+DB_POOL_WARMUP = _env_flag("DB_POOL_WARMUP", "true")
+
+# Statements slower than this many milliseconds are logged and aggregated in the
+# report at GET /api/metrics/slow-queries (0 disables); their plan is captured
+# with EXPLAIN unless SLOW_QUERY_EXPLAIN is off
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN = _env_flag("SLOW_QUERY_EXPLAIN", "true")
+SLOW_QUERY_MAX_ENTRIES = int(os.getenv("SLOW_QUERY_MAX_ENTRIES", "200"))
+
+# Checkout counters shared by the sync and async pools
+pool_metrics = {
+    "checkouts": 0,
+    "checkout_timeouts": 0,
+    "checkout_wait_seconds_total": 0.0,
+    "checkout_wait_seconds_max": 0.0,
+}
+_pool_metrics_lock = threading.Lock()
+
+def _record_checkout(elapsed: float, timed_out: bool = False):
+    with _pool_metrics_lock:
+        if timed_out:
+            pool_metrics["checkout_timeouts"] += 1
+        else:
+            pool_metrics["checkouts"] += 1
+        pool_metrics["checkout_wait_seconds_total"] += elapsed
+        if elapsed > pool_metrics["checkout_wait_seconds_max"]:
+            pool_metrics["checkout_wait_seconds_max"] = elapsed
+
+class _CheckoutTimingMixin:
+    """Times every pool checkout, i.e. how long a request waited for a connection."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            _record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        _record_checkout(time.perf_counter() - start)
+        return conn
 
-engine = create_engine(DATABASE_URL)
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+def _engine_options(url: str, async_driver: bool = False) -> dict:
+    """Pool/connect options for the app engines; SQLite keeps SQLAlchemy's defaults."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if async_driver else InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        # asyncpg calls it `timeout`, libpq/psycopg2 `connect_timeout`
+        "connect_args": {"timeout": DB_CONNECT_TIMEOUT} if async_driver else {"connect_timeout": DB_CONNECT_TIMEOUT},
+    }
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+slow_query_log = SlowQueryLog(SLOW_QUERY_MS, explain=SLOW_QUERY_EXPLAIN, max_entries=SLOW_QUERY_MAX_ENTRIES)
+slow_query_log.attach(engine)
+
+def _async_database_url(url: str) -> str:
+    """Map DATABASE_URL onto an async driver (asyncpg / aiosqlite)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+        # asyncpg takes `ssl` instead of libpq's `sslmode` and rejects libpq-only options
+        if "sslmode" in parsed.query:
+            parsed = parsed.update_query_dict({"ssl": parsed.query["sslmode"]})
+        parsed = parsed.difference_update_query(["sslmode", "channel_binding"])
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    ASYNC_DATABASE_URL = _async_database_url(RAW_DATABASE_URL)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options(ASYNC_DATABASE_URL, async_driver=True))
+    # Objects are returned to FastAPI after the session is gone, so they must not expire
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    slow_query_log.attach(async_engine.sync_engine, async_engine)
+
+def _reset_pools_after_fork():
+    """
+    A forked worker (gunicorn's preload_app) must not reuse connections opened by the
+    parent: start it with empty pools, leaving the parent's connections alone.
+    """
+    engine.dispose(close=False)
+    if async_engine is not None:
+        async_engine.sync_engine.dispose(close=False)
+
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+def _pool_status(pool) -> dict:
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": DB_MAX_OVERFLOW,
+    }
+
+def get_pool_stats() -> dict:
+    """Current in-use/idle/overflow counts per engine plus cumulative checkout timings."""
+    with _pool_metrics_lock:
+        stats = dict(pool_metrics)
+    stats["sync"] = _pool_status(engine.pool)
+    if async_engine is not None:
+        stats["async"] = _pool_status(async_engine.pool)
+    return stats
+
+def warm_pool():
+    """Open DB_POOL_SIZE connections on the sync engine and return them to the pool."""
+    connections = []
+    try:
+        for _ in range(DB_POOL_SIZE):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+
+async def warm_async_pool():
+    """Same as warm_pool() for the async engine."""
+    if async_engine is None:
+        return
+    connections = []
+    try:
+        for _ in range(DB_POOL_SIZE):
+            connections.append(await async_engine.connect())
+    finally:
+        for connection in connections:
+            await connection.close()
+
+async def dispose_engines():
+    """Close every pooled connection (app shutdown)."""
+    await run_in_threadpool(engine.dispose)
+    if async_engine is not None:
+        await async_engine.dispose()
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Session dependency for `async def` routes; pair it with run_db()
+get_session = get_async_db if DB_ASYNC else get_db
+
+async def run_db(db, fn, *args, **kwargs):
+    """
+    Call a sync service/controller function `fn(db, *args, **kwargs)` from an async route.
+
+    In async mode the function runs on the AsyncSession's greenlet, so its queries are
+    awaited on the event loop; otherwise it runs in the threadpool with the sync session.
+    """
+    if DB_ASYNC:
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+async def run_in_session(fn, *args, **kwargs):
+    """
+    Like run_db() for work outside a request (background tasks, startup): opens a
+    session of the configured kind, calls `fn(db, *args, **kwargs)` and closes it.
+    """
+    if DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            return await db.run_sync(fn, *args, **kwargs)
+
+    def call():
+        db = SessionLocal()
+        try:
+            return fn(db, *args, **kwargs)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(call)
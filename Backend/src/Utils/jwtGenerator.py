@@ -1,8 +1,12 @@
 import jwt
 from datetime import datetime, timedelta
-from redis import asyncio as redis
 from dotenv import load_dotenv
+from src.Utils.cache import LRUCache
+import calendar
+import hashlib
 import os
+import time
+import uuid
 
 load_dotenv()
 
@@ -13,6 +17,9 @@ exp = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
 
 REDIS_URL = os.getenv("REDIS_URL")
 
+# Verified claims are cached per token (keyed by its SHA-256) until the token's exp
+JWT_CLAIMS_CACHE_SIZE = int(os.getenv("JWT_CLAIMS_CACHE_SIZE", "10000"))
+
 try:
     ACCESS_TOKEN_EXPIRE_MINUTES = int(exp)
 except (TypeError, ValueError):
@@ -21,11 +28,18 @@ except (TypeError, ValueError):
 if not SECRET_KEY or not ALGORITHM or not ACCESS_TOKEN_EXPIRE_MINUTES:
     raise EnvironmentError("JWT configuration is missing in environment variables .")
 
-# Only initialize redis_client if REDIS_URL is set and valid
+# Only initialize redis_client if REDIS_URL is set and valid (and only then import
+# redis, which is a sizeable import for deployments that do not use it)
 redis_client = None
 if REDIS_URL and REDIS_URL.startswith(("redis://", "rediss://", "unix://")):
+    from redis import asyncio as redis
     redis_client = redis.from_url(REDIS_URL, decode_responses=True)
 
+async def close_redis_client():
+    """Close the Redis connection pool (app shutdown)."""
+    if redis_client is not None:
+        await redis_client.aclose()
+
 
 import asyncio
 
@@ -34,9 +48,14 @@ def create_access_token(data: dict, expires_minutes: int = ACCESS_TOKEN_EXPIRE_M
     expire = datetime.utcnow() + timedelta(minutes=expires_minutes)
     # JWT requires exp as Unix timestamp (integer), not datetime object
     # Use calendar.timegm for UTC timestamp calculation
-    import calendar
     expire_timestamp = int(calendar.timegm(expire.utctimetuple()))
-    to_encode.update({"exp": expire_timestamp})
+    to_encode.update({
+        "exp": expire_timestamp,
+        # Millisecond precision so a revocation and a fresh login in the same second differ
+        "iat": round(time.time(), 3),
+        # Unique id so a single token can be revoked (see src/Utils/revocation.py)
+        "jti": uuid.uuid4().hex,
+    })
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     
     # Ensure token is a string (PyJWT 2.x returns string, but be safe)
@@ -50,13 +69,22 @@ def create_access_token(data: dict, expires_minutes: int = ACCESS_TOKEN_EXPIRE_M
 
     return encoded_jwt
 
+claims_cache = LRUCache(maxsize=JWT_CLAIMS_CACHE_SIZE)
+
 def decode_access_token(token: str):
+    # A token that verified once stays valid until exp, so repeat requests skip
+    # the signature check and JSON parsing. Invalid tokens are never cached.
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    payload = claims_cache.get(digest)
+    if payload is not None:
+        return dict(payload)
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except jwt.PyJWTError:
         return None
+    if isinstance(payload.get("exp"), (int, float)):
+        claims_cache.set(digest, dict(payload), expires_at=payload["exp"])
+    return payload
 
-# async def logout(token: str = Depends(oauth2_scheme)):
-#     await redis_client.setex(f"blacklist:{token}", int(ttl), "invalidated")
-#     return {"message": "Successfully logged out"}
\ No newline at end of file
+def get_claims_cache_stats() -> dict:
+    return claims_cache.stats()
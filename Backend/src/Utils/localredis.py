@@ -0,0 +1,110 @@
+import fnmatch
+import threading
+import time
+
+class LocalRedis:
+    """
+    In-process stand-in for the redis.asyncio client, covering the commands this
+    app uses (strings with expiry, hashes, sorted sets). Used when REDIS_URL is not
+    set, e.g. local development and tests; state is per process, so it is not a
+    substitute for Redis once several workers need to share it.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, key):
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    async def ping(self):
+        return True
+
+    async def aclose(self):
+        return None
+
+    # Strings
+    async def get(self, key):
+        with self._lock:
+            return self._data.get(key) if self._alive(key) else None
+
+    async def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = str(value)
+            if ex is not None:
+                self._expires[key] = time.time() + ex
+            else:
+                self._expires.pop(key, None)
+            return True
+
+    async def setex(self, key, seconds, value):
+        return await self.set(key, value, ex=seconds)
+
+    async def delete(self, *keys):
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if self._alive(key):
+                    del self._data[key]
+                    self._expires.pop(key, None)
+                    removed += 1
+            return removed
+
+    async def keys(self, pattern="*"):
+        with self._lock:
+            return [key for key in list(self._data) if self._alive(key) and fnmatch.fnmatchcase(key, pattern)]
+
+    # Hashes
+    async def hset(self, key, field=None, value=None, mapping=None):
+        with self._lock:
+            if not self._alive(key):
+                self._data[key] = {}
+            bucket = self._data[key]
+            items = dict(mapping or {})
+            if field is not None:
+                items[field] = value
+            added = sum(1 for name in items if name not in bucket)
+            bucket.update({name: str(val) for name, val in items.items()})
+            return added
+
+    async def hdel(self, key, *fields):
+        with self._lock:
+            bucket = self._data.get(key, {}) if self._alive(key) else {}
+            return sum(1 for name in fields if bucket.pop(name, None) is not None)
+
+    async def hgetall(self, key):
+        with self._lock:
+            return dict(self._data.get(key, {})) if self._alive(key) else {}
+
+    # Sorted sets
+    async def zadd(self, key, mapping):
+        with self._lock:
+            if not self._alive(key):
+                self._data[key] = {}
+            bucket = self._data[key]
+            added = sum(1 for member in mapping if member not in bucket)
+            bucket.update({member: float(score) for member, score in mapping.items()})
+            return added
+
+    async def zrangebyscore(self, key, min, max, withscores=False):
+        low, high = float(min), float(max)
+        with self._lock:
+            bucket = self._data.get(key, {}) if self._alive(key) else {}
+            members = sorted((score, member) for member, score in bucket.items() if low <= score <= high)
+        if withscores:
+            return [(member, score) for score, member in members]
+        return [member for _, member in members]
+
+    async def zremrangebyscore(self, key, min, max):
+        low, high = float(min), float(max)
+        with self._lock:
+            bucket = self._data.get(key, {}) if self._alive(key) else {}
+            doomed = [member for member, score in bucket.items() if low <= score <= high]
+            for member in doomed:
+                del bucket[member]
+            return len(doomed)
@@ -0,0 +1,155 @@
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# With several worker processes each one writes its samples under this directory
+# and /metrics merges them (prometheus_client's multiprocess mode)
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+# Requests that matched no route share one label, so unknown paths cannot blow up
+# the number of series
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+http_requests_total = Counter(
+    "http_requests_total",
+    "HTTP requests by route template, method and status code",
+    ["method", "route", "status"],
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving the request to sending the last body chunk",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+# The route is only known once the router has matched, so in-flight requests are by method
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+db_statements_per_request = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed while serving a request",
+    ["method", "route"],
+    buckets=STATEMENT_COUNT_BUCKETS,
+)
+db_time_per_request_seconds = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL statements while serving a request",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+# All statements, including background tasks and startup work outside any request
+db_statement_duration_seconds = Histogram(
+    "db_statement_duration_seconds",
+    "Execution time of single SQL statements",
+    buckets=LATENCY_BUCKETS,
+)
+
+class _RequestDBStats:
+    __slots__ = ("scope", "statements", "seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.statements = 0
+        self.seconds = 0.0
+
+# Set by the middleware for the duration of a request. Threadpool calls and tasks
+# started by the request copy the context, so they add to the same object.
+_request_db_stats: ContextVar[Optional[_RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    db_statement_duration_seconds.observe(elapsed)
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += elapsed
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start"):
+        connection.info["query_start"].pop()
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+def current_route() -> Optional[str]:
+    """Route template of the request being served in this context, None outside requests."""
+    stats = _request_db_stats.get()
+    return _route_label(stats.scope) if stats is not None else None
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status and SQL statement count/time per
+    route template (e.g. /api/appointments/{appointment_id}, not the raw path).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status_code = 500
+        stats = _RequestDBStats(scope)
+        token = _request_db_stats.set(stats)
+        in_progress = http_requests_in_progress.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            _request_db_stats.reset(token)
+            route = _route_label(scope)
+            http_requests_total.labels(method, route, str(status_code)).inc()
+            http_request_duration_seconds.labels(method, route).observe(elapsed)
+            db_statements_per_request.labels(method, route).observe(stats.statements)
+            db_time_per_request_seconds.labels(method, route).observe(stats.seconds)
+
+def render_metrics() -> bytes:
+    """All metrics in the Prometheus text format (merged across workers in multiprocess mode)."""
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
@@ -0,0 +1,193 @@
+import base64
+import binascii
+import json
+import os
+from datetime import date, datetime
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import and_, or_, tuple_
+
+from src.Utils.conditional import LIST_CACHE_CONTROL, conditional_response, weak_etag
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class Page(NamedTuple):
+    items: list
+    next_cursor: Optional[str]
+    # Weak ETag of the page, for collections paginated with a version_column
+    etag: Optional[str] = None
+
+def list_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    sort: Optional[str] = Query(None, description="Sort key (collection specific, e.g. date, name)"),
+    order: Optional[str] = Query(None, pattern="^(asc|desc)$", description="Sort direction"),
+    patient_id: Optional[UUID] = Query(None),
+    doctor_id: Optional[UUID] = Query(None),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    date_from: Optional[datetime] = Query(None, description="Inclusive lower bound on the collection's date"),
+    date_to: Optional[datetime] = Query(None, description="Exclusive upper bound on the collection's date"),
+) -> dict:
+    """Query parameters shared by every collection endpoint."""
+    return {
+        "limit": limit,
+        "cursor": cursor,
+        "sort": sort,
+        "order": order,
+        "patient_id": patient_id,
+        "doctor_id": doctor_id,
+        "status": status_filter,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+
+def default_list_params(**overrides) -> dict:
+    """list_params() defaults for callers outside a request (scripts, internal reuse)."""
+    params = {
+        "limit": DEFAULT_PAGE_SIZE,
+        "cursor": None,
+        "sort": None,
+        "order": None,
+        "patient_id": None,
+        "doctor_id": None,
+        "status": None,
+        "date_from": None,
+        "date_to": None,
+    }
+    params.update(overrides)
+    return params
+
+def page_response(response: Response, page: Page, request: Optional[Request] = None, cache_control: str = LIST_CACHE_CONTROL):
+    """
+    Put the next cursor (and the page's ETag) in the response headers and return the
+    page's items as the body, or a bare 304 if the request's If-None-Match matches.
+    """
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if page.etag:
+        not_modified = conditional_response(request, response, page.etag, cache_control)
+        if not_modified is not None:
+            return not_modified
+    return page.items
+
+def _encode_cursor(sort: str, order: str, value, last_id) -> str:
+    payload = json.dumps([sort, order, value, last_id], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def _decode_value(column, raw):
+    if raw is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return raw
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is date:
+        return date.fromisoformat(raw)
+    if python_type is UUID:
+        return UUID(raw)
+    return raw
+
+def _decode_cursor(cursor: str, sort: str, order: str, column, id_column):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, raw_value, raw_id = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_sort != sort or cursor_order != order:
+            raise ValueError("cursor belongs to a different sort")
+        return _decode_value(column, raw_value), _decode_value(id_column, raw_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor. Restart from the first page with the same sort.")
+
+def _is_nullable(column) -> bool:
+    expression = getattr(column, "expression", column)
+    return getattr(expression, "nullable", True)
+
+def _keyset_after(column, id_column, value, last_id, descending: bool):
+    """Rows strictly after (value, last_id) in ORDER BY column, id (NULLs last)."""
+    if not _is_nullable(column):
+        # Row-value comparison lets Postgres walk a (column, id) index directly
+        if descending:
+            return tuple_(column, id_column) < tuple_(value, last_id)
+        return tuple_(column, id_column) > tuple_(value, last_id)
+    next_id = id_column < last_id if descending else id_column > last_id
+    if value is None:
+        return and_(column.is_(None), next_id)
+    beyond = column < value if descending else column > value
+    return or_(beyond, and_(column == value, next_id), column.is_(None))
+
+def apply_filters(query, params: dict, filter_columns: Optional[dict] = None):
+    """Apply the patient_id / doctor_id / status / date filters of list_params() to a Query or select()."""
+    filter_columns = filter_columns or {}
+    for key in ("patient_id", "doctor_id", "status"):
+        if params.get(key) is None:
+            continue
+        if key not in filter_columns:
+            raise HTTPException(status_code=400, detail=f"Filter '{key}' is not supported for this collection")
+        query = query.filter(filter_columns[key] == params[key])
+    if params.get("date_from") is not None or params.get("date_to") is not None:
+        if "date" not in filter_columns:
+            raise HTTPException(status_code=400, detail="Date range filters are not supported for this collection")
+        if params.get("date_from") is not None:
+            query = query.filter(filter_columns["date"] >= params["date_from"])
+        if params.get("date_to") is not None:
+            query = query.filter(filter_columns["date"] < params["date_to"])
+    return query
+
+def paginate(
+    query,
+    params: dict,
+    sort_columns: dict,
+    id_column,
+    filter_columns: Optional[dict] = None,
+    default_sort: str = "date",
+    default_order: str = "desc",
+    version_column=None,
+) -> Page:
+    """
+    Apply list_params() filters, sort and keyset pagination to a Query.
+
+    sort_columns maps the public sort keys to columns; filter_columns maps
+    patient_id / doctor_id / status / date to the columns they filter on. Results
+    are ordered by (sort column, id) so the cursor stays stable across pages.
+    With a version_column (updated_at, which must be among the selected columns)
+    the page also gets a weak ETag over its rows' (id, version) pairs.
+    """
+    query = apply_filters(query, params, filter_columns)
+
+    sort = params.get("sort") or default_sort
+    if sort not in sort_columns:
+        allowed = ", ".join(sorted(sort_columns))
+        raise HTTPException(status_code=400, detail=f"Unsupported sort key '{sort}'. Use one of: {allowed}")
+    order = params.get("order") or default_order
+    descending = order == "desc"
+    column = sort_columns[sort]
+
+    if params.get("cursor"):
+        value, last_id = _decode_cursor(params["cursor"], sort, order, column, id_column)
+        query = query.filter(_keyset_after(column, id_column, value, last_id, descending))
+
+    sort_clause = column.desc() if descending else column.asc()
+    if _is_nullable(column):
+        sort_clause = sort_clause.nulls_last()
+    query = query.order_by(sort_clause, id_column.desc() if descending else id_column.asc())
+
+    limit = params.get("limit") or DEFAULT_PAGE_SIZE
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor(sort, order, getattr(last, column.key), getattr(last, id_column.key))
+    etag = None
+    if version_column is not None:
+        etag = weak_etag(next_cursor, *(
+            (getattr(row, id_column.key), getattr(row, version_column.key)) for row in rows
+        ))
+    return Page(rows, next_cursor, etag)
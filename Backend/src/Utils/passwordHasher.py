@@ -1,15 +1,122 @@
-from passlib.context import CryptContext
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import multiprocessing
+import os
 
-# Create a CryptContext that supports Argon2 first, then bcrypt (deprecated)
-pwd_context = CryptContext(
-    schemes=["argon2", "bcrypt"],
-    deprecated="auto"
-)
+# Argon2 cost parameters (passlib's defaults). Raising them only affects new hashes;
+# existing ones are upgraded the next time their owner logs in.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
+# Processes that run the hashing; 0 falls back to Starlette's threadpool
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(os.cpu_count() or 1, 4))))
+# Hash/verify jobs allowed to be queued or running at once before requests get a 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(max(PASSWORD_HASH_WORKERS, 1) * 8)))
+
+# Create a CryptContext that supports Argon2 first, then bcrypt (deprecated).
+# Built on first use: with the process pool the hashing happens in the worker
+# processes, so the app process never needs to import passlib and its backends.
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(
+        schemes=["argon2", "bcrypt"],
+        deprecated="auto",
+        argon2__rounds=ARGON2_TIME_COST,
+        argon2__memory_cost=ARGON2_MEMORY_COST,
+        argon2__parallelism=ARGON2_PARALLELISM,
+    )
 
 # Hash a password using Argon2 by default (if available)
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 # Verify a password against its hash
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+def _needs_rehash(hashed_password: str) -> bool:
+    pwd_context = get_pwd_context()
+    if pwd_context.needs_update(hashed_password):
+        return True
+    # passlib only flags deprecated schemes, not Argon2 hashes made with other costs
+    if pwd_context.identify(hashed_password) != "argon2":
+        return False
+    params = pwd_context.handler("argon2").from_string(hashed_password)
+    return (params.rounds, params.memory_cost, params.parallelism) != (
+        ARGON2_TIME_COST, ARGON2_MEMORY_COST, ARGON2_PARALLELISM
+    )
+
+# Verify a password and, if its hash uses outdated parameters, return a fresh hash
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    pwd_context = get_pwd_context()
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False, None
+    if _needs_rehash(hashed_password):
+        return True, pwd_context.hash(plain_password)
+    return True, None
+
+_executor = None
+_pending = 0
+
+def _get_executor():
+    global _executor
+    if _executor is None and PASSWORD_HASH_WORKERS > 0:
+        # spawn: forking a process that already runs an event loop and threads is unsafe
+        _executor = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+async def _run_hashing(fn, *args):
+    """Run a hashing job off the event loop, rejecting new work once the queue is full."""
+    global _pending
+    if _pending >= PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The server is busy processing sign-ins. Please try again in a moment.",
+            headers={"Retry-After": "1"},
+        )
+    _pending += 1
+    try:
+        executor = _get_executor()
+        if executor is None:
+            return await run_in_threadpool(fn, *args)
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+    finally:
+        _pending -= 1
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str):
+    return await _run_hashing(verify_and_update_password, plain_password, hashed_password)
+
+def _warm_hash_worker() -> int:
+    get_pwd_context()
+    return os.getpid()
+
+async def start_hash_executor():
+    """Start the worker processes (and load passlib in them) up front so the first logins don't pay for it."""
+    executor = _get_executor()
+    if executor is not None:
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, _warm_hash_worker) for _ in range(PASSWORD_HASH_WORKERS)))
+
+def shutdown_hash_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+def get_hash_executor_stats() -> dict:
+    return {
+        "workers": PASSWORD_HASH_WORKERS,
+        "pending": _pending,
+        "max_pending": PASSWORD_HASH_MAX_PENDING,
+    }
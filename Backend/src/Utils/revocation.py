@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from src.Utils.jwtGenerator import redis_client, ACCESS_TOKEN_EXPIRE_MINUTES
+from src.Utils.localredis import LocalRedis
+
+logger = logging.getLogger(__name__)
+
+# Revoked token ids (jti) live in a sorted set scored by the token's exp, so expired
+# entries can be pruned by score. "Log out everywhere" is a per-user timestamp:
+# tokens issued at or before it are rejected.
+REVOKED_JTI_KEY = "auth:revoked:jti"
+REVOKED_USERS_KEY = "auth:revoked:users"
+
+# How often each worker pulls the revocation list from Redis. Revocations made by a
+# worker apply to that worker immediately and to the others within this interval.
+REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "5"))
+
+# Without REDIS_URL revocations are kept in process (single worker / development)
+revocation_store = redis_client if redis_client is not None else LocalRedis()
+
+_revoked_jtis = {}
+_revoked_users = {}
+_local_lock = threading.Lock()
+
+def is_token_revoked(payload: dict) -> bool:
+    """Hot-path check against this worker's copy of the revocation list; no I/O."""
+    jti = payload.get("jti")
+    with _local_lock:
+        if jti is not None and jti in _revoked_jtis:
+            return True
+        revoked_before = _revoked_users.get(str(payload.get("user_id")))
+    if revoked_before is None:
+        return False
+    issued_at = payload.get("iat")
+    # Tokens minted before jti/iat were added cannot be told apart, so they go too
+    return issued_at is None or issued_at <= revoked_before
+
+async def revoke_token(payload: dict):
+    """Revoke a single token (logout) until it would have expired anyway."""
+    jti = payload.get("jti")
+    expires_at = float(payload.get("exp") or time.time())
+    if jti is None:
+        # Token predates jti: the only way to kill it is to revoke the user's tokens
+        await revoke_user_tokens(payload.get("user_id"))
+        return
+    with _local_lock:
+        _revoked_jtis[jti] = expires_at
+    await revocation_store.zadd(REVOKED_JTI_KEY, {jti: expires_at})
+
+async def revoke_user_tokens(user_id):
+    """Revoke every token issued to a user up to now (forced logout)."""
+    revoked_before = round(time.time(), 3)
+    with _local_lock:
+        _revoked_users[str(user_id)] = revoked_before
+    await revocation_store.hset(REVOKED_USERS_KEY, str(user_id), revoked_before)
+
+async def refresh_revocations():
+    """Merge the current revocation list from Redis into this worker's copy."""
+    now = time.time()
+    await revocation_store.zremrangebyscore(REVOKED_JTI_KEY, "-inf", now)
+    jtis = await revocation_store.zrangebyscore(REVOKED_JTI_KEY, now, "+inf", withscores=True)
+    users = await revocation_store.hgetall(REVOKED_USERS_KEY)
+    # A user-wide revocation only matters while tokens issued before it can still be alive
+    horizon = now - ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    stale_users = [user_id for user_id, revoked_before in users.items() if float(revoked_before) < horizon]
+    if stale_users:
+        await revocation_store.hdel(REVOKED_USERS_KEY, *stale_users)
+    with _local_lock:
+        # Merge rather than replace, so a revocation written locally while this
+        # refresh was in flight is not dropped
+        for jti, expires_at in jtis:
+            _revoked_jtis[jti] = float(expires_at)
+        for jti in [jti for jti, expires_at in _revoked_jtis.items() if expires_at <= now]:
+            del _revoked_jtis[jti]
+        for user_id, revoked_before in users.items():
+            revoked_before = float(revoked_before)
+            if revoked_before >= horizon and revoked_before > _revoked_users.get(user_id, 0):
+                _revoked_users[user_id] = revoked_before
+        for user_id in [user_id for user_id, revoked_before in _revoked_users.items() if revoked_before < horizon]:
+            del _revoked_users[user_id]
+
+async def revocation_refresher():
+    """Background loop started with the app; keeps the local revocation list current."""
+    while True:
+        try:
+            await refresh_revocations()
+        except Exception as e:
+            # Keep serving from the last good copy until Redis is reachable again
+            logger.warning("Revocation list refresh failed: %s: %s", type(e).__name__, e)
+        await asyncio.sleep(REVOCATION_REFRESH_SECONDS)
+
+def get_revocation_stats() -> dict:
+    with _local_lock:
+        return {
+            "revoked_tokens": len(_revoked_jtis),
+            "revoked_users": len(_revoked_users),
+            "backend": type(revocation_store).__name__,
+        }
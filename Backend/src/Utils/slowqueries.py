@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+from src.Utils.metrics import current_route
+
+logger = logging.getLogger(__name__)
+
+# Statements EXPLAIN accepts; transaction control, DDL etc. are only logged
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+def _param_shape(parameters):
+    """Types of the bound parameters, never their values (they can hold patient data)."""
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: one shape for all rows
+            return {"rows": len(parameters), "row": _param_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__ if parameters is not None else None
+
+def _first_row(parameters):
+    if isinstance(parameters, list) and parameters and isinstance(parameters[0], (dict, list, tuple)):
+        return parameters[0]
+    return parameters
+
+def _one_line(statement: str) -> str:
+    return " ".join(statement.split())
+
+class SlowQueryLog:
+    """
+    Statements slower than `threshold_ms`, aggregated per SQL text (parameters are
+    bound separately, so one entry covers every call of the same query). The first
+    time a statement is slow its plan is captured with EXPLAIN on a separate
+    connection, off the request's path. Per process, bounded to `max_entries`.
+    """
+
+    def __init__(self, threshold_ms: float, explain: bool = True, max_entries: int = 200):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._tasks = set()
+
+    def attach(self, engine, async_engine=None):
+        """
+        Time every statement run on `engine`. For an AsyncEngine pass its sync_engine
+        as `engine` and the AsyncEngine itself as `async_engine`, which runs the EXPLAINs.
+        """
+        if self.threshold_ms <= 0:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_factory(engine, async_engine))
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    def _after_factory(self, engine, async_engine):
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get("slow_query_start")
+            if not starts:
+                return
+            elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+            if elapsed_ms < self.threshold_ms or statement.lstrip().upper().startswith("EXPLAIN"):
+                return
+            if self._record(statement, parameters, elapsed_ms) and self.explain and conn.dialect.name == "postgresql":
+                self._schedule_explain(engine, async_engine, statement, _first_row(parameters))
+        return after_cursor_execute
+
+    def _record(self, statement: str, parameters, elapsed_ms: float) -> bool:
+        """Add one slow execution; True when the statement still needs its plan captured."""
+        route = current_route() or "<background>"
+        shape = _param_shape(parameters)
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s",
+            elapsed_ms, route, _one_line(statement)[:1000],
+            extra={"duration_ms": round(elapsed_ms, 3), "route": route, "param_shape": shape},
+        )
+        with self._lock:
+            entry = self._entries.get(statement)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    # Make room by dropping the statement that has cost the least so far
+                    del self._entries[min(self._entries, key=lambda key: self._entries[key]["total_ms"])]
+                entry = self._entries[statement] = {
+                    "statement": statement,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "routes": {},
+                    "param_shape": shape,
+                    "plan": None,
+                    "plan_requested": False,
+                    "last_seen": None,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["routes"][route] = entry["routes"].get(route, 0) + 1
+            entry["param_shape"] = shape
+            entry["last_seen"] = datetime.now(timezone.utc).isoformat()
+            if entry["plan_requested"] or not statement.lstrip().upper().startswith(_EXPLAINABLE):
+                return False
+            entry["plan_requested"] = True
+            return True
+
+    def _schedule_explain(self, engine, async_engine, statement: str, parameters):
+        sql = f"EXPLAIN (ANALYZE off) {statement}"
+        if async_engine is not None:
+            # Async mode: the listener runs on the event loop (in the session's greenlet)
+            task = asyncio.get_running_loop().create_task(self._explain_async(async_engine, statement, sql, parameters))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._executor.submit(self._explain_sync, engine, statement, sql, parameters)
+
+    def _explain_sync(self, engine, statement: str, sql: str, parameters):
+        try:
+            with engine.connect() as conn:
+                rows = conn.exec_driver_sql(sql, parameters).all()
+            self._store_plan(statement, "\n".join(row[0] for row in rows))
+        except Exception as e:
+            self._store_plan(statement, f"EXPLAIN failed: {type(e).__name__}: {str(e)}")
+
+    async def _explain_async(self, async_engine, statement: str, sql: str, parameters):
+        try:
+            async with async_engine.connect() as conn:
+                rows = (await conn.exec_driver_sql(sql, parameters)).all()
+            self._store_plan(statement, "\n".join(row[0] for row in rows))
+        except Exception as e:
+            self._store_plan(statement, f"EXPLAIN failed: {type(e).__name__}: {str(e)}")
+
+    def _store_plan(self, statement: str, plan: str):
+        logger.info("Plan of slow query %s:\n%s", _one_line(statement)[:200], plan)
+        with self._lock:
+            entry = self._entries.get(statement)
+            if entry is not None:
+                entry["plan"] = plan
+
+    def top(self, limit: int = 10, sort: str = "total_ms") -> list:
+        """The `limit` worst statements by total_ms, max_ms or count."""
+        with self._lock:
+            entries = [dict(entry, routes=dict(entry["routes"])) for entry in self._entries.values()]
+        entries.sort(key=lambda entry: entry[sort], reverse=True)
+        for entry in entries:
+            entry.pop("plan_requested")
+            entry["total_ms"] = round(entry["total_ms"], 3)
+            entry["max_ms"] = round(entry["max_ms"], 3)
+            entry["avg_ms"] = round(entry["total_ms"] / entry["count"], 3)
+        return entries[:limit]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def shutdown(self):
+        """Drop the EXPLAINs still queued or running (app shutdown)."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
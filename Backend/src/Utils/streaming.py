@@ -0,0 +1,126 @@
+import os
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+import orjson
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from src.Utils import db as database
+
+# Rows fetched from the server-side cursor per round trip; also the rows per chunk sent
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+def export_params(
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json (one array) or ndjson (one object per line)"),
+    patient_id: Optional[UUID] = Query(None),
+    doctor_id: Optional[UUID] = Query(None),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    date_from: Optional[datetime] = Query(None, description="Inclusive lower bound on the collection's date"),
+    date_to: Optional[datetime] = Query(None, description="Exclusive upper bound on the collection's date"),
+) -> dict:
+    """Query parameters of the export endpoints: the list filters plus the output format."""
+    return {
+        "format": format,
+        "patient_id": patient_id,
+        "doctor_id": doctor_id,
+        "status": status_filter,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+
+def _default(value):
+    # orjson encodes datetime, date and uuid.UUID itself, like ORJSONResponse; asyncpg
+    # returns its own UUID subclass, which orjson does not accept
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _encode(row) -> bytes:
+    return orjson.dumps(dict(row), default=_default)
+
+class _Framer:
+    """Turns batches of rows into the pieces of a JSON array or an NDJSON stream."""
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self._first = True
+
+    def start(self) -> bytes:
+        return b"[" if self.fmt == "json" else b""
+
+    def batch(self, rows) -> bytes:
+        if self.fmt == "ndjson":
+            return b"".join(_encode(row) + b"\n" for row in rows)
+        body = b",".join(_encode(row) for row in rows)
+        if not self._first:
+            body = b"," + body
+        self._first = False
+        return body
+
+    def end(self) -> bytes:
+        return b"]" if self.fmt == "json" else b""
+
+def _iterate_sync(session, result, fmt: str):
+    framer = _Framer(fmt)
+    try:
+        yield framer.start()
+        for rows in result.mappings().partitions():
+            yield framer.batch(rows)
+        yield framer.end()
+    finally:
+        result.close()
+        session.close()
+
+async def _iterate_async(session, result, fmt: str):
+    framer = _Framer(fmt)
+    try:
+        yield framer.start()
+        async for rows in result.mappings().partitions():
+            yield framer.batch(rows)
+        yield framer.end()
+    finally:
+        await result.close()
+        await session.close()
+
+async def stream_rows(statement, fmt: str, filename: str) -> StreamingResponse:
+    """
+    Stream the rows of a Core select() as a JSON array or NDJSON.
+
+    The statement runs on a session owned by the response, with yield_per so rows come
+    from a server-side cursor EXPORT_BATCH_SIZE at a time; memory stays flat whatever
+    the table size. The query is started before the response is returned, so a failing
+    statement still produces an error status instead of a truncated body.
+    """
+    statement = statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+    if database.DB_ASYNC:
+        session = database.AsyncSessionLocal()
+        try:
+            result = await session.stream(statement)
+        except BaseException:
+            await session.close()
+            raise
+        body = _iterate_async(session, result, fmt)
+    else:
+        session = database.SessionLocal()
+        try:
+            result = await run_in_threadpool(session.execute, statement)
+        except BaseException:
+            session.close()
+            raise
+        body = _iterate_sync(session, result, fmt)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
@@ -0,0 +1,30 @@
+import importlib.util
+import logging
+import os
+
+from uvicorn_worker import UvicornWorker
+
+# Seconds a worker keeps serving in-flight requests after SIGTERM (see gunicorn.conf.py)
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+
+class ClinicHubWorker(UvicornWorker):
+    """
+    Gunicorn worker running the app on uvicorn with uvloop and the httptools
+    parser chosen explicitly rather than left to "auto" (uvloop is not available
+    on Windows, where the asyncio loop is used).
+    """
+
+    CONFIG_KWARGS = {
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        "http": "httptools",
+        "timeout_graceful_shutdown": GRACEFUL_TIMEOUT,
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # UvicornWorker points uvicorn's loggers at gunicorn's handlers; send them
+        # back through the app's log queue (src/Utils/logger.py)
+        for name in ("uvicorn.error", "uvicorn.access"):
+            uvicorn_logger = logging.getLogger(name)
+            uvicorn_logger.handlers = []
+            uvicorn_logger.propagate = True
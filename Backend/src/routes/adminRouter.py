@@ -1,9 +1,8 @@
-from fastapi import APIRouter, Depends, status, Body, HTTPException
-from sqlalchemy.orm import Session
-import traceback
-import traceback
+import logging
+from fastapi import APIRouter, Depends, status, Body, HTTPException, Request, Response
+from uuid import UUID
 from src.Controllers.adminController import (
-	list_doctors_controller,
+	doctor_directory_controller,
 	create_doctor_controller,
 	update_doctor_controller,
 	delete_doctor_controller,
@@ -15,109 +14,135 @@ from src.Controllers.adminController import (
 	update_admin_profile_controller
 )
 from src.Utils.dependencies import require_admin, get_current_user
-from src.Middlewares.userpydanticmodel import UserEdit
-from src.Utils.db import get_db
+from src.Middlewares.userpydanticmodel import UserEdit, AppointmentResponse, UserProfileResponse, ProfileUpdateResponse
+from src.Utils.db import get_session, run_db
+from src.Utils.pagination import list_params, page_response
+from src.Utils.streaming import export_params, stream_rows
+from src.Utils.revocation import revoke_user_tokens
+from src.Utils.conditional import PROFILE_CACHE_CONTROL, conditional_response, weak_etag
+from src.Services.authservices import get_user_version
+
+logger = logging.getLogger(__name__)
 
 adminRouter = APIRouter(prefix="/api/admin", tags=["Admin"])
 
 # Doctor CRUD
 @adminRouter.get("/doctors")
-def list_doctors(db: Session = Depends(get_db)):
+async def list_doctors(request: Request, response: Response, params: dict = Depends(list_params)):
 	"""
 	Get all doctors.
 	Returns a list of all doctors in the system.
 	"""
 	try:
-		return list_doctors_controller(db)
+		page = await doctor_directory_controller(params)
+		return page_response(response, page, request)
 	except HTTPException:
 		raise
 	except Exception as e:
-		print(f"Unexpected error in list_doctors route: {type(e).__name__}: {str(e)}")
-		print(traceback.format_exc())
+		logger.exception("Unexpected error in list_doctors route")
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			detail=f"Failed to retrieve doctors: {str(e)}"
 		)
 
 @adminRouter.post("/doctors", status_code=status.HTTP_201_CREATED)
-def create_doctor(doctor: dict = Body(...), db: Session = Depends(get_db)):
-	return create_doctor_controller(db, doctor)
+async def create_doctor(doctor: dict = Body(...), db=Depends(get_session)):
+	return await run_db(db, create_doctor_controller, doctor)
 
 @adminRouter.put("/doctors/{doctor_id}")
-def update_doctor(doctor_id: str, doctor: dict = Body(...), db: Session = Depends(get_db)):
-	return update_doctor_controller(db, doctor_id, doctor)
+async def update_doctor(doctor_id: str, doctor: dict = Body(...), db=Depends(get_session)):
+	return await run_db(db, update_doctor_controller, doctor_id, doctor)
 
 @adminRouter.delete("/doctors/{doctor_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_doctor(doctor_id: str, db: Session = Depends(get_db)):
-	return delete_doctor_controller(db, doctor_id)
+async def delete_doctor(doctor_id: str, db=Depends(get_session)):
+	return await run_db(db, delete_doctor_controller, doctor_id)
 
 # Patient CRUD
 @adminRouter.get("/patients")
-def list_patients(db: Session = Depends(get_db)):
+async def list_patients(request: Request, response: Response, params: dict = Depends(list_params), db=Depends(get_session)):
 	"""
 	Get all patients.
 	Returns a list of all patients in the system.
 	"""
 	try:
-		return list_patients_controller(db)
+		page = await run_db(db, list_patients_controller, params)
+		return page_response(response, page, request)
 	except HTTPException:
 		raise
 	except Exception as e:
-		print(f"Unexpected error in list_patients route: {type(e).__name__}: {str(e)}")
-		print(traceback.format_exc())
+		logger.exception("Unexpected error in list_patients route")
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			detail=f"Failed to retrieve patients: {str(e)}"
 		)
 
 @adminRouter.post("/patients", status_code=status.HTTP_201_CREATED)
-def create_patient(patient: dict = Body(...), db: Session = Depends(get_db)):
-	return create_patient_controller(db, patient)
+async def create_patient(patient: dict = Body(...), db=Depends(get_session)):
+	return await run_db(db, create_patient_controller, patient)
 
 @adminRouter.put("/patients/{patient_id}")
-def update_patient(patient_id: str, patient: dict = Body(...), db: Session = Depends(get_db)):
-	return update_patient_controller(db, patient_id, patient)
+async def update_patient(patient_id: str, patient: dict = Body(...), db=Depends(get_session)):
+	return await run_db(db, update_patient_controller, patient_id, patient)
 
 @adminRouter.delete("/patients/{patient_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_patient(patient_id: str, db: Session = Depends(get_db)):
-	return delete_patient_controller(db, patient_id)
+async def delete_patient(patient_id: str, db=Depends(get_session)):
+	return await run_db(db, delete_patient_controller, patient_id)
+
+# Force logout: every token issued to the user so far stops working
+@adminRouter.post("/users/{user_id}/revoke-tokens", dependencies=[Depends(require_admin)])
+async def revoke_tokens(user_id: UUID):
+	await revoke_user_tokens(user_id)
+	return {"message": "All sessions for this user have been revoked"}
 
 # Admin appointments endpoint
-@adminRouter.get("/appointments")
-def get_all_appointments(db: Session = Depends(get_db)):
+@adminRouter.get("/appointments", response_model=list[AppointmentResponse])
+async def get_all_appointments(request: Request, response: Response, params: dict = Depends(list_params), db=Depends(get_session)):
 	"""
 	Get all appointments (Admin only).
 	Returns a list of all appointments in the system.
 	"""
 	from src.Controllers.appointmentController import list_appointments_controller
 	try:
-		return list_appointments_controller(db)
+		page = await run_db(db, list_appointments_controller, params)
+		return page_response(response, page, request)
 	except HTTPException:
 		raise
 	except Exception as e:
-		print(f"Unexpected error in get_all_appointments route: {type(e).__name__}: {str(e)}")
-		print(traceback.format_exc())
+		logger.exception("Unexpected error in get_all_appointments route")
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			detail=f"Failed to retrieve appointments: {str(e)}"
 		)
 
+@adminRouter.get("/appointments/export", dependencies=[Depends(require_admin)])
+async def export_all_appointments(params: dict = Depends(export_params)):
+	"""
+	Stream all appointments matching the filters (Admin only).
+	?format=json returns one JSON array, ?format=ndjson one object per line.
+	"""
+	from src.Controllers.appointmentController import export_appointments_controller
+	return await stream_rows(export_appointments_controller(params), params["format"], "appointments")
+
 # Admin Profile endpoints
-@adminRouter.get("/profile")
-def get_admin_profile(current_user=Depends(get_current_user), db: Session = Depends(get_db)):
+@adminRouter.get("/profile", response_model=UserProfileResponse)
+async def get_admin_profile(request: Request, response: Response, current_user=Depends(get_current_user), db=Depends(get_session)):
 	"""
 	Get current admin's profile.
 	Requires authentication.
 	"""
 	admin_id = current_user.get("user_id")
-	return get_admin_profile_controller(db, admin_id)
+	version = await run_db(db, get_user_version, admin_id)
+	not_modified = conditional_response(request, response, weak_etag(admin_id, version), PROFILE_CACHE_CONTROL)
+	if not_modified is not None:
+		return not_modified
+	return await run_db(db, get_admin_profile_controller, admin_id)
 
-@adminRouter.put("/profile")
-def update_admin_profile(user_data: UserEdit = Body(...), current_user=Depends(get_current_user), db: Session = Depends(get_db)):
+@adminRouter.put("/profile", response_model=ProfileUpdateResponse)
+async def update_admin_profile(user_data: UserEdit = Body(...), current_user=Depends(get_current_user), db=Depends(get_session)):
 	"""
 	Update current admin's profile.
 	Requires authentication.
 	"""
 	admin_id = current_user.get("user_id")
-	updated = update_admin_profile_controller(db, admin_id, user_data)
+	updated = await run_db(db, update_admin_profile_controller, admin_id, user_data)
 	return {"message": "Profile updated successfully", "user": updated}
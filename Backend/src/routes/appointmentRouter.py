@@ -1,5 +1,4 @@
-from fastapi import APIRouter, Depends, status, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, status, Body, Request, Response
 from src.Controllers.appointmentController import (
 	create_appointment_controller,
 	get_appointment_controller,
@@ -7,26 +6,29 @@ from src.Controllers.appointmentController import (
 	delete_appointment_controller,
 	list_appointments_controller
 )
-from src.Utils.db import get_db
+from src.Utils.db import get_session, run_db
+from src.Middlewares.userpydanticmodel import AppointmentResponse
+from src.Utils.pagination import list_params, page_response
 
 appointmentRouter = APIRouter(prefix="/api/appointments", tags=["Appointments"])
 
-@appointmentRouter.post("/", status_code=status.HTTP_201_CREATED)
-def create_appointment(appointment: dict = Body(...), db: Session = Depends(get_db)):
-	return create_appointment_controller(db, appointment)
+@appointmentRouter.post("/", response_model=AppointmentResponse, status_code=status.HTTP_201_CREATED)
+async def create_appointment(appointment: dict = Body(...), db=Depends(get_session)):
+	return await run_db(db, create_appointment_controller, appointment)
 
-@appointmentRouter.get("/{appointment_id}")
-def get_appointment(appointment_id: str, db: Session = Depends(get_db)):
-	return get_appointment_controller(db, appointment_id)
+@appointmentRouter.get("/{appointment_id}", response_model=AppointmentResponse)
+async def get_appointment(appointment_id: str, db=Depends(get_session)):
+	return await run_db(db, get_appointment_controller, appointment_id)
 
-@appointmentRouter.put("/{appointment_id}")
-def update_appointment(appointment_id: str, appointment: dict = Body(...), db: Session = Depends(get_db)):
-	return update_appointment_controller(db, appointment_id, appointment)
+@appointmentRouter.put("/{appointment_id}", response_model=AppointmentResponse)
+async def update_appointment(appointment_id: str, appointment: dict = Body(...), db=Depends(get_session)):
+	return await run_db(db, update_appointment_controller, appointment_id, appointment)
 
 @appointmentRouter.delete("/{appointment_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_appointment(appointment_id: str, db: Session = Depends(get_db)):
-	return delete_appointment_controller(db, appointment_id)
+async def delete_appointment(appointment_id: str, db=Depends(get_session)):
+	return await run_db(db, delete_appointment_controller, appointment_id)
 
-@appointmentRouter.get("/")
-def list_appointments(db: Session = Depends(get_db)):
-	return list_appointments_controller(db)
+@appointmentRouter.get("/", response_model=list[AppointmentResponse])
+async def list_appointments(request: Request, response: Response, params: dict = Depends(list_params), db=Depends(get_session)):
+	page = await run_db(db, list_appointments_controller, params)
+	return page_response(response, page, request)
@@ -1,12 +1,21 @@
 
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
 from src.Controllers.authController import login_controller
-from src.Utils.db import get_db
+from src.Utils.db import get_session
+from src.Utils.dependencies import get_current_user
+from src.Utils.revocation import revoke_token
 from src.Middlewares.userpydanticmodel import UserLogin
 
 authRouter = APIRouter(prefix="/api/auth", tags=["Auth"])
 
 @authRouter.post("/login", status_code=status.HTTP_200_OK)
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    return login_controller(db, user.email, user.password)
+async def login(user: UserLogin, db=Depends(get_session)):
+    return await login_controller(db, user.email, user.password)
+
+@authRouter.post("/logout", status_code=status.HTTP_200_OK)
+async def logout(current_user=Depends(get_current_user)):
+    """
+    Revoke the bearer token used for this request.
+    """
+    await revoke_token(current_user)
+    return {"message": "Successfully logged out"}
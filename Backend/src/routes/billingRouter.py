@@ -1,19 +1,22 @@
-from fastapi import APIRouter, Depends, status, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, status, Body, Request, Response
 from src.Controllers.billingController import (
 	create_billing_controller,
 	get_billing_controller,
 	update_billing_controller,
 	delete_billing_controller,
-	list_billings_controller
+	list_billings_controller,
+	export_billings_controller
 )
-from src.Utils.db import get_db
-from src.Middlewares.userpydanticmodel import BillingCreate, BillingUpdate
+from src.Utils.db import get_session, run_db
+from src.Utils.pagination import list_params, page_response
+from src.Utils.streaming import export_params, stream_rows
+from src.Utils.dependencies import require_admin
+from src.Middlewares.userpydanticmodel import BillingCreate, BillingUpdate, BillingResponse
 
 billingRouter = APIRouter(prefix="/api/billing", tags=["Billing"])
 
-@billingRouter.post("/", status_code=status.HTTP_201_CREATED)
-def create_billing(billing: BillingCreate, db: Session = Depends(get_db)):
+@billingRouter.post("/", response_model=BillingResponse, status_code=status.HTTP_201_CREATED)
+async def create_billing(billing: BillingCreate, db=Depends(get_session)):
 	"""
 	Create a new billing record.
 	Requires patient_id, amount, and optionally appointment_id.
@@ -25,25 +28,35 @@ def create_billing(billing: BillingCreate, db: Session = Depends(get_db)):
 		"status": billing.status,
 		"description": billing.description
 	}
-	return create_billing_controller(db, billing_dict)
+	return await run_db(db, create_billing_controller, billing_dict)
 
-@billingRouter.get("/{billing_id}")
-def get_billing(billing_id: str, db: Session = Depends(get_db)):
-	return get_billing_controller(db, billing_id)
+# Declared before /{billing_id} so "export" is not taken for an id
+@billingRouter.get("/export", dependencies=[Depends(require_admin)])
+async def export_billings(params: dict = Depends(export_params)):
+	"""
+	Stream every billing record matching the filters (Admin only).
+	?format=json returns one JSON array, ?format=ndjson one object per line.
+	"""
+	return await stream_rows(export_billings_controller(params), params["format"], "billings")
+
+@billingRouter.get("/{billing_id}", response_model=BillingResponse)
+async def get_billing(billing_id: str, db=Depends(get_session)):
+	return await run_db(db, get_billing_controller, billing_id)
 
-@billingRouter.put("/{billing_id}")
-def update_billing(billing_id: str, billing: BillingUpdate, db: Session = Depends(get_db)):
+@billingRouter.put("/{billing_id}", response_model=BillingResponse)
+async def update_billing(billing_id: str, billing: BillingUpdate, db=Depends(get_session)):
 	"""
 	Update an existing billing record.
 	All fields are optional - only provided fields will be updated.
 	"""
 	billing_dict = billing.to_dict()
-	return update_billing_controller(db, billing_id, billing_dict)
+	return await run_db(db, update_billing_controller, billing_id, billing_dict)
 
 @billingRouter.delete("/{billing_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_billing(billing_id: str, db: Session = Depends(get_db)):
-	return delete_billing_controller(db, billing_id)
+async def delete_billing(billing_id: str, db=Depends(get_session)):
+	return await run_db(db, delete_billing_controller, billing_id)
 
-@billingRouter.get("/")
-def list_billings(db: Session = Depends(get_db)):
-	return list_billings_controller(db)
+@billingRouter.get("/", response_model=list[BillingResponse])
+async def list_billings(request: Request, response: Response, params: dict = Depends(list_params), db=Depends(get_session)):
+	page = await run_db(db, list_billings_controller, params)
+	return page_response(response, page, request)
@@ -1,65 +1,80 @@
-from fastapi import APIRouter, Depends, status, Body, HTTPException
-from sqlalchemy.orm import Session
-import traceback
+import logging
+from fastapi import APIRouter, Depends, status, Body, HTTPException, Query, Request, Response
 from src.Middlewares.userpydanticmodel import UserRegister, UserEdit
 from src.Controllers.doctorController import (
     register_doctor_controller,
     get_doctor_profile_controller,
     update_doctor_profile_controller,
     delete_doctor_profile_controller,
+    get_patient_records_controller,
+    create_patient_record_controller,
+    get_doctor_availability_controller,
 )
-from src.Controllers.medicalrecordController import create_medicalrecord_controller
-from src.Models.medicalrecordmodel import MedicalRecord
-from src.Models.usermodel import User
-from src.Utils.db import get_db
+from src.Utils.db import get_session, run_db
 from src.Utils.dependencies import require_admin, require_admin_or_doctor, get_current_user
+from src.Utils.conditional import PROFILE_CACHE_CONTROL, conditional_response, weak_etag
+from src.Services.authservices import get_user_version
+from src.Utils.passwordHasher import hash_password_async
 from uuid import UUID
+from datetime import date
+from typing import Optional
+
+logger = logging.getLogger(__name__)
 
 doctorRouter = APIRouter(prefix="/api/doctor", tags=["Doctor"])
 
 @doctorRouter.post("/register", status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_admin)])
-def register_doctor(user: UserRegister = Body(...), db: Session = Depends(get_db), admin=Depends(require_admin)):
-    db_user = register_doctor_controller(db, user)
+async def register_doctor(user: UserRegister = Body(...), db=Depends(get_session), admin=Depends(require_admin)):
+    password_hash = await hash_password_async(user.password)
+    db_user = await run_db(db, register_doctor_controller, user, password_hash)
     return {"message": "Doctor registered successfully", "user_id": str(db_user.id)}
 
 # Get current doctor's own profile (without user_id in path)
 @doctorRouter.get("/profile")
-def get_current_doctor_profile(current_user=Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_current_doctor_profile(request: Request, response: Response, current_user=Depends(get_current_user), db=Depends(get_session)):
     """
     Get current doctor's profile.
-    Requires authentication.
+    Requires authentication. Answers 304 if If-None-Match holds the current ETag.
     """
     doctor_id = current_user.get("user_id")
-    return get_doctor_profile_controller(db, doctor_id)
+    version = await run_db(db, get_user_version, doctor_id)
+    not_modified = conditional_response(request, response, weak_etag(doctor_id, version), PROFILE_CACHE_CONTROL)
+    if not_modified is not None:
+        return not_modified
+    return await run_db(db, get_doctor_profile_controller, doctor_id)
 
 # Get specific doctor profile by user_id (for admin viewing)
 @doctorRouter.get("/profile/{user_id}", dependencies=[Depends(require_admin_or_doctor)])
-def get_profile(user_id: str, db: Session = Depends(get_db), user=Depends(require_admin_or_doctor)):
-    return get_doctor_profile_controller(db, user_id)
+async def get_profile(user_id: str, request: Request, response: Response, db=Depends(get_session), user=Depends(require_admin_or_doctor)):
+    version = await run_db(db, get_user_version, user_id)
+    not_modified = conditional_response(request, response, weak_etag(user_id, version), PROFILE_CACHE_CONTROL)
+    if not_modified is not None:
+        return not_modified
+    return await run_db(db, get_doctor_profile_controller, user_id)
 
 # Update current doctor's own profile (without user_id in path)
 @doctorRouter.put("/profile")
-def update_current_doctor_profile(user_data: UserEdit = Body(...), current_user=Depends(get_current_user), db: Session = Depends(get_db)):
+async def update_current_doctor_profile(user_data: UserEdit = Body(...), current_user=Depends(get_current_user), db=Depends(get_session)):
     """
     Update current doctor's profile.
     Requires authentication.
     """
     doctor_id = current_user.get("user_id")
-    updated = update_doctor_profile_controller(db, doctor_id, user_data)
+    updated = await run_db(db, update_doctor_profile_controller, doctor_id, user_data)
     return {"message": "Profile updated successfully", "user": updated}
 
 # Update specific doctor profile by user_id (for admin editing)
 @doctorRouter.put("/profile/{user_id}", dependencies=[Depends(require_admin_or_doctor)])
-def update_profile(user_id: str, user: UserEdit = Body(...), db: Session = Depends(get_db), current_user=Depends(require_admin_or_doctor)):
-    updated = update_doctor_profile_controller(db, user_id, user)
+async def update_profile(user_id: str, user: UserEdit = Body(...), db=Depends(get_session), current_user=Depends(require_admin_or_doctor)):
+    updated = await run_db(db, update_doctor_profile_controller, user_id, user)
     return {"message": "Profile updated", "user": updated}
 
 @doctorRouter.delete("/profile/{user_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_admin_or_doctor)])
-def delete_profile(user_id: str, db: Session = Depends(get_db), user=Depends(require_admin_or_doctor)):
-    return delete_doctor_profile_controller(db, user_id)
+async def delete_profile(user_id: str, db=Depends(get_session), user=Depends(require_admin_or_doctor)):
+    return await run_db(db, delete_doctor_profile_controller, user_id)
 
 @doctorRouter.get("/patients/{patient_id}/records")
-def get_patient_medical_records(patient_id: str, current_user=Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_patient_medical_records(patient_id: str, current_user=Depends(get_current_user), db=Depends(get_session)):
     """Get all medical records for a specific patient (doctor view)"""
     try:
         doctor_id = current_user.get("user_id")
@@ -71,37 +86,18 @@ def get_patient_medical_records(patient_id: str, current_user=Depends(get_curren
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid patient ID format")
         
-        # Get medical records for this patient
-        medical_records = db.query(MedicalRecord).filter(MedicalRecord.patient_id == patient_uuid).all()
-        
-        # Convert SQLAlchemy objects to dictionaries for JSON serialization
-        result = []
-        for record in medical_records:
-            # Fetch doctor information
-            doctor = db.query(User).filter(User.id == record.doctor_id).first()
-            result.append({
-                "id": str(record.id),
-                "patient_id": str(record.patient_id),
-                "doctor_id": str(record.doctor_id),
-                "doctor_name": doctor.name if doctor else "Unknown Doctor",
-                "type": record.type or "",
-                "title": record.title or "",
-                "date": record.date.isoformat() if record.date else None,
-                "details": record.details or None,
-            })
-        return result
+        return await run_db(db, get_patient_records_controller, patient_uuid)
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in get_patient_medical_records: {type(e).__name__}: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error in get_patient_medical_records")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve medical records: {str(e)}"
         )
 
 @doctorRouter.post("/patients/{patient_id}/records", status_code=status.HTTP_201_CREATED)
-def create_patient_medical_record(patient_id: str, record_data: dict = Body(...), current_user=Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_patient_medical_record(patient_id: str, record_data: dict = Body(...), current_user=Depends(get_current_user), db=Depends(get_session)):
     """Create a medical record for a patient (doctor only)"""
     try:
         doctor_id = current_user.get("user_id")
@@ -123,39 +119,26 @@ def create_patient_medical_record(patient_id: str, record_data: dict = Body(...)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid patient ID format")
         
-        patient = db.query(User).filter(User.id == patient_uuid).first()
-        if not patient:
-            raise HTTPException(status_code=404, detail="Patient not found")
-        
-        # Create medical record data
-        medical_record_dict = {
-            "patient_id": str(patient_uuid),
-            "doctor_id": doctor_id,
-            "type": record_type,
-            "title": title,
-            "details": record_data.get("details", ""),
-        }
-        
-        # Create medical record
-        medical_record = create_medicalrecord_controller(db, medical_record_dict)
-        
-        # Convert to dict for response
-        return {
-            "id": str(medical_record.id),
-            "patient_id": str(medical_record.patient_id),
-            "doctor_id": str(medical_record.doctor_id),
-            "type": medical_record.type,
-            "title": medical_record.title,
-            "date": medical_record.date.isoformat() if medical_record.date else None,
-            "details": medical_record.details,
-            "message": "Medical record created successfully"
-        }
+        return await run_db(db, create_patient_record_controller, doctor_id, patient_uuid, record_data)
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in create_patient_medical_record: {type(e).__name__}: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error in create_patient_medical_record")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create medical record: {str(e)}"
         )
+
+@doctorRouter.get("/{doctor_id}/availability")
+async def get_doctor_availability(
+    doctor_id: UUID,
+    date_from: Optional[date] = Query(None, alias="from", description="First day (default: today)"),
+    date_to: Optional[date] = Query(None, alias="to", description="Day after the last one (default: from + 7 days)"),
+    current_user=Depends(get_current_user),
+    db=Depends(get_session),
+):
+    """
+    Free and booked appointment slots of a doctor, per day.
+    Slot starts use the same clock as appointment dates.
+    """
+    return await run_db(db, get_doctor_availability_controller, doctor_id, date_from, date_to)
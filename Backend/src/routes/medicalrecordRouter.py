@@ -1,5 +1,4 @@
-from fastapi import APIRouter, Depends, status, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, status, Body, Request, Response
 from src.Controllers.medicalrecordController import (
 	create_medicalrecord_controller,
 	get_medicalrecord_controller,
@@ -7,26 +6,29 @@ from src.Controllers.medicalrecordController import (
 	delete_medicalrecord_controller,
 	list_medicalrecords_controller
 )
-from src.Utils.db import get_db
+from src.Utils.db import get_session, run_db
+from src.Middlewares.userpydanticmodel import MedicalRecordResponse
+from src.Utils.pagination import list_params, page_response
 
 medicalrecordRouter = APIRouter(prefix="/api/medicalrecord", tags=["MedicalRecords"])
 
-@medicalrecordRouter.post("/", status_code=status.HTTP_201_CREATED)
-def create_medicalrecord(record: dict = Body(...), db: Session = Depends(get_db)):
-	return create_medicalrecord_controller(db, record)
+@medicalrecordRouter.post("/", response_model=MedicalRecordResponse, status_code=status.HTTP_201_CREATED)
+async def create_medicalrecord(record: dict = Body(...), db=Depends(get_session)):
+	return await run_db(db, create_medicalrecord_controller, record)
 
-@medicalrecordRouter.get("/{record_id}")
-def get_medicalrecord(record_id: str, db: Session = Depends(get_db)):
-	return get_medicalrecord_controller(db, record_id)
+@medicalrecordRouter.get("/{record_id}", response_model=MedicalRecordResponse)
+async def get_medicalrecord(record_id: str, db=Depends(get_session)):
+	return await run_db(db, get_medicalrecord_controller, record_id)
 
-@medicalrecordRouter.put("/{record_id}")
-def update_medicalrecord(record_id: str, record: dict = Body(...), db: Session = Depends(get_db)):
-	return update_medicalrecord_controller(db, record_id, record)
+@medicalrecordRouter.put("/{record_id}", response_model=MedicalRecordResponse)
+async def update_medicalrecord(record_id: str, record: dict = Body(...), db=Depends(get_session)):
+	return await run_db(db, update_medicalrecord_controller, record_id, record)
 
 @medicalrecordRouter.delete("/{record_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_medicalrecord(record_id: str, db: Session = Depends(get_db)):
-	return delete_medicalrecord_controller(db, record_id)
+async def delete_medicalrecord(record_id: str, db=Depends(get_session)):
+	return await run_db(db, delete_medicalrecord_controller, record_id)
 
-@medicalrecordRouter.get("/")
-def list_medicalrecords(db: Session = Depends(get_db)):
-	return list_medicalrecords_controller(db)
+@medicalrecordRouter.get("/", response_model=list[MedicalRecordResponse])
+async def list_medicalrecords(request: Request, response: Response, params: dict = Depends(list_params), db=Depends(get_session)):
+	page = await run_db(db, list_medicalrecords_controller, params)
+	return page_response(response, page, request)
@@ -0,0 +1,92 @@
+import hmac
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+from src.Utils.db import get_pool_stats, slow_query_log
+from src.Utils.dependencies import require_admin
+from src.Utils.jwtGenerator import get_claims_cache_stats
+from src.Utils.revocation import get_revocation_stats
+from src.Utils.passwordHasher import get_hash_executor_stats
+from src.Services.directoryservices import get_directory_stats
+from src.Utils.metrics import render_metrics
+from src.Utils.logger import get_logging_stats
+
+metricsRouter = APIRouter(prefix="/api/metrics", tags=["Metrics"])
+# Scraped by Prometheus, which does not log in: protected by a static bearer token
+# (METRICS_TOKEN) instead of a user JWT. Without a token the endpoint does not exist
+# (404) unless METRICS_PUBLIC=true opens it on purpose
+prometheusRouter = APIRouter(tags=["Metrics"])
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").strip().lower() in ("1", "true", "yes", "on")
+
+def require_metrics_token(request: Request):
+    if not METRICS_TOKEN:
+        if METRICS_PUBLIC:
+            return
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+@prometheusRouter.get("/metrics", dependencies=[Depends(require_metrics_token)], include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Request latency, status counts, in-flight requests and per-request SQL
+    statement counts/time in the Prometheus text format.
+    """
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+@metricsRouter.get("/db-pool", dependencies=[Depends(require_admin)])
+async def db_pool_metrics():
+    """
+    Connection pool usage for this worker process.
+    Returns in-use/idle/overflow counts and cumulative checkout wait times.
+    """
+    return get_pool_stats()
+
+@metricsRouter.get("/auth-cache", dependencies=[Depends(require_admin)])
+async def auth_cache_metrics():
+    """
+    Verified-JWT claims cache for this worker process: size, hits and misses.
+    """
+    return get_claims_cache_stats()
+
+@metricsRouter.get("/revocations", dependencies=[Depends(require_admin)])
+async def revocation_metrics():
+    """
+    Size of this worker's copy of the token revocation list.
+    """
+    return get_revocation_stats()
+
+@metricsRouter.get("/password-hashing", dependencies=[Depends(require_admin)])
+async def password_hashing_metrics():
+    """
+    Password hashing pool for this worker process: workers and queued jobs.
+    """
+    return get_hash_executor_stats()
+
+@metricsRouter.get("/doctor-directory", dependencies=[Depends(require_admin)])
+async def doctor_directory_metrics():
+    """
+    Doctor directory cache for this worker process: pages held, hits and misses.
+    """
+    return get_directory_stats()
+
+@metricsRouter.get("/logging", dependencies=[Depends(require_admin)])
+async def logging_metrics():
+    """
+    Log queue of this worker process: records waiting for the writer thread and records dropped.
+    """
+    return get_logging_stats()
+
+@metricsRouter.get("/slow-queries", dependencies=[Depends(require_admin)])
+async def slow_query_report(
+    limit: int = Query(10, ge=1, le=200),
+    sort: str = Query("total_ms", pattern="^(total_ms|max_ms|count)$"),
+):
+    """
+    Slowest statements seen by this worker process (over SLOW_QUERY_MS), with
+    call counts, timings, the routes that ran them and their EXPLAIN plan.
+    """
+    return slow_query_log.top(limit, sort)
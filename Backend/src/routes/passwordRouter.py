@@ -1,14 +1,15 @@
 from fastapi import APIRouter, Depends, Body, status
-from sqlalchemy.orm import Session
 from src.Controllers.passwordController import set_new_password_controller
-from src.Utils.db import get_db
+from src.Utils.db import get_session, run_db
+from src.Utils.passwordHasher import hash_password_async
 
 passwordRouter = APIRouter(prefix="/api/password", tags=["Password"])
 
 @passwordRouter.post("/set-password", status_code=status.HTTP_200_OK)
-def set_new_password(
+async def set_new_password(
     user_id: str = Body(...),
     new_password: str = Body(...),
-    db: Session = Depends(get_db)
+    db=Depends(get_session)
 ):
-    return set_new_password_controller(db, user_id, new_password)
+    password_hash = await hash_password_async(new_password)
+    return await run_db(db, set_new_password_controller, user_id, new_password, password_hash)
@@ -1,5 +1,4 @@
-from fastapi import APIRouter, Depends, status, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, status, Body, Request, Response
 from src.Controllers.prescriptionController import (
 	create_prescription_controller,
 	get_prescription_controller,
@@ -7,26 +6,29 @@ from src.Controllers.prescriptionController import (
 	delete_prescription_controller,
 	list_prescriptions_controller
 )
-from src.Utils.db import get_db
+from src.Utils.db import get_session, run_db
+from src.Middlewares.userpydanticmodel import PrescriptionResponse
+from src.Utils.pagination import list_params, page_response
 
 prescriptionRouter = APIRouter(prefix="/api/prescriptions", tags=["Prescriptions"])
 
-@prescriptionRouter.post("/", status_code=status.HTTP_201_CREATED)
-def create_prescription(prescription: dict = Body(...), db: Session = Depends(get_db)):
-	return create_prescription_controller(db, prescription)
+@prescriptionRouter.post("/", response_model=PrescriptionResponse, status_code=status.HTTP_201_CREATED)
+async def create_prescription(prescription: dict = Body(...), db=Depends(get_session)):
+	return await run_db(db, create_prescription_controller, prescription)
 
-@prescriptionRouter.get("/{prescription_id}")
-def get_prescription(prescription_id: str, db: Session = Depends(get_db)):
-	return get_prescription_controller(db, prescription_id)
+@prescriptionRouter.get("/{prescription_id}", response_model=PrescriptionResponse)
+async def get_prescription(prescription_id: str, db=Depends(get_session)):
+	return await run_db(db, get_prescription_controller, prescription_id)
 
-@prescriptionRouter.put("/{prescription_id}")
-def update_prescription(prescription_id: str, prescription: dict = Body(...), db: Session = Depends(get_db)):
-	return update_prescription_controller(db, prescription_id, prescription)
+@prescriptionRouter.put("/{prescription_id}", response_model=PrescriptionResponse)
+async def update_prescription(prescription_id: str, prescription: dict = Body(...), db=Depends(get_session)):
+	return await run_db(db, update_prescription_controller, prescription_id, prescription)
 
 @prescriptionRouter.delete("/{prescription_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_prescription(prescription_id: str, db: Session = Depends(get_db)):
-	return delete_prescription_controller(db, prescription_id)
+async def delete_prescription(prescription_id: str, db=Depends(get_session)):
+	return await run_db(db, delete_prescription_controller, prescription_id)
 
-@prescriptionRouter.get("/")
-def list_prescriptions(db: Session = Depends(get_db)):
-	return list_prescriptions_controller(db)
+@prescriptionRouter.get("/", response_model=list[PrescriptionResponse])
+async def list_prescriptions(request: Request, response: Response, params: dict = Depends(list_params), db=Depends(get_session)):
+	page = await run_db(db, list_prescriptions_controller, params)
+	return page_response(response, page, request)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import ORJSONResponse
+from src.Services.readinessservices import database_status
+
+# Container probes: unauthenticated, kept out of the API docs
+probeRouter = APIRouter(tags=["Probes"])
+
+_NO_STORE = {"Cache-Control": "no-store"}
+
+@probeRouter.get("/healthz", include_in_schema=False)
+async def healthz():
+    """Liveness: the process is up and its event loop answers. Checks nothing else."""
+    return ORJSONResponse({"status": "ok"}, headers=_NO_STORE)
+
+@probeRouter.get("/readyz", include_in_schema=False)
+async def readyz(request: Request):
+    """
+    Readiness: startup warm-up has finished (see lifespan in index.py) and the
+    database answers and is migrated to head. 503 until all of them hold.
+    """
+    started = getattr(request.app.state, "ready", False)
+    database = await database_status()
+    ready = started and database["ok"]
+    body = {
+        "status": "ok" if ready else "unavailable",
+        "startup": "ok" if started else "pending",
+        "database": database["database"],
+        "migrations": database["migrations"],
+    }
+    return ORJSONResponse(body, status_code=200 if ready else 503, headers=_NO_STORE)
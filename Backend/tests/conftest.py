@@ -0,0 +1,65 @@
+"""
+Test setup: the app runs against a throwaway SQLite database, or TEST_DATABASE_URL
+(e.g. a scratch Postgres database), with password hashing in the threadpool and
+no Redis. The environment is set here because the app reads it at import time.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="clinichub-tests-")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", f"sqlite:///{_db_dir}/test.db")
+os.environ["SECRET_KEY"] = "test-secret-key-of-at-least-32-bytes"
+os.environ["ALGORITHM"] = "HS256"
+os.environ["REDIS_URL"] = ""
+os.environ["DB_ASYNC"] = "false"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["SLOW_QUERY_MS"] = "0"
+os.environ["LOG_LEVEL"] = "WARNING"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+@pytest.fixture(scope="session")
+def app():
+    import index
+    from src.Models.usermodel import Base
+    # Imported so every table is registered on Base.metadata
+    from src.Models import appointmentmodel, billingmodel, medicalrecordmodel, prescriptionmodel, stockmodel  # noqa: F401
+    from src.Utils.db import engine
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield index.app
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+    shutil.rmtree(_db_dir, ignore_errors=True)
+
+@pytest.fixture(scope="session")
+def client(app):
+    # Not entered as a context manager: the lifespan (pool and cache warm-up,
+    # background refreshers) is not needed to serve single requests
+    return TestClient(app)
+
+@pytest.fixture
+def db(app):
+    from src.Utils.db import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def auth_headers(app):
+    """Bearer headers for a User row, as issued at login."""
+    from src.Utils.jwtGenerator import create_access_token
+
+    def headers(user) -> dict:
+        token = create_access_token({"user_id": str(user.id), "role": user.role.value, "email": user.email})
+        return {"Authorization": f"Bearer {token}"}
+
+    return headers
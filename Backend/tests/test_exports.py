@@ -0,0 +1,65 @@
+"""
+The streamed exports return every appointment and billing record, so they are
+admin-only like the paged listings they mirror.
+"""
+import uuid
+
+import pytest
+
+EXPORTS = ["/api/admin/appointments/export", "/api/billing/export"]
+
+@pytest.fixture(scope="module")
+def users(app):
+    from src.Models.usermodel import User, UserRole
+    from src.Utils.db import SessionLocal
+
+    db = SessionLocal()
+    data = {
+        role.value: User(id=uuid.uuid4(), name=role.value.title(), email=f"{role.value}-{uuid.uuid4().hex}@example.com", role=role)
+        for role in (UserRole.ADMIN, UserRole.PATIENT)
+    }
+    db.add_all(data.values())
+    db.commit()
+    for user in data.values():
+        db.refresh(user)
+    db.expunge_all()
+    db.close()
+    return data
+
+@pytest.mark.parametrize("path", EXPORTS)
+def test_export_rejects_anonymous(client, path):
+    response = client.get(path)
+    assert response.status_code in (401, 403)
+
+@pytest.mark.parametrize("path", EXPORTS)
+def test_export_rejects_non_admin(client, auth_headers, users, path):
+    response = client.get(path, headers=auth_headers(users["patient"]))
+    assert response.status_code == 403
+
+@pytest.mark.parametrize("path", EXPORTS)
+def test_export_allows_admin(client, auth_headers, users, path):
+    response = client.get(path, params={"format": "ndjson"}, headers=auth_headers(users["admin"]))
+    assert response.status_code == 200
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson"])
+def test_billing_export_encodes_rows(client, auth_headers, users, fmt):
+    import orjson
+    from datetime import datetime
+    from src.Models.billingmodel import Billing
+    from src.Utils.db import SessionLocal
+
+    db = SessionLocal()
+    billing = Billing(id=uuid.uuid4(), patient_id=users["patient"].id, amount=12.5, status="Paid", date=datetime(2030, 1, 7, 8, 30))
+    db.add(billing)
+    db.commit()
+    billing_id = str(billing.id)
+    db.close()
+
+    response = client.get("/api/billing/export", params={"format": fmt, "patient_id": str(users["patient"].id)},
+                          headers=auth_headers(users["admin"]))
+    assert response.status_code == 200
+    rows = orjson.loads(response.content) if fmt == "json" else [orjson.loads(line) for line in response.content.splitlines()]
+    row = next(row for row in rows if row["id"] == billing_id)
+    assert row["patient_id"] == str(users["patient"].id)
+    assert row["amount"] == 12.5
+    assert row["date"] == "2030-01-07T08:30:00"
@@ -0,0 +1,29 @@
+"""
+GET /metrics is closed unless a scrape token is configured (or it is opened on purpose
+with METRICS_PUBLIC=true), since it lists every route with its traffic.
+"""
+import pytest
+
+@pytest.fixture
+def metrics_config(monkeypatch):
+    from src.routes import metricsRouter
+
+    def configure(token=None, public=False):
+        monkeypatch.setattr(metricsRouter, "METRICS_TOKEN", token)
+        monkeypatch.setattr(metricsRouter, "METRICS_PUBLIC", public)
+
+    return configure
+
+def test_metrics_hidden_by_default(client, metrics_config):
+    metrics_config()
+    assert client.get("/metrics").status_code == 404
+
+def test_metrics_public_when_opened(client, metrics_config):
+    metrics_config(public=True)
+    assert client.get("/metrics").status_code == 200
+
+def test_metrics_require_the_token(client, metrics_config):
+    metrics_config(token="scrape-token")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-token"}).status_code == 200
@@ -0,0 +1,80 @@
+"""
+The patient's appointment and record listings and the doctor's view of a patient's
+records load each row's doctor in the same query (joinedload), so the number of
+statements per request must not grow with the number of rows (no N+1).
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+# Rows per listing, each with its own doctor so a per-row lookup cannot be
+# served from the session's identity map
+ROWS = 25
+
+@contextmanager
+def count_statements():
+    from src.Utils.db import engine
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+@pytest.fixture(scope="module")
+def seeded(app):
+    from src.Models.usermodel import User, UserRole
+    from src.Models.appointmentmodel import Appointment
+    from src.Models.medicalrecordmodel import MedicalRecord
+    from src.Utils.db import SessionLocal
+
+    db = SessionLocal()
+    patient = User(id=uuid.uuid4(), name="Patient", email=f"patient-{uuid.uuid4().hex}@example.com", role=UserRole.PATIENT)
+    doctors = [
+        User(id=uuid.uuid4(), name=f"Doctor {index}", email=f"doctor-{uuid.uuid4().hex}@example.com",
+             role=UserRole.DOCTOR, specialization="General")
+        for index in range(ROWS)
+    ]
+    db.add(patient)
+    db.add_all(doctors)
+    start = datetime(2030, 1, 7, 8, 0)
+    for index, doctor in enumerate(doctors):
+        db.add(Appointment(
+            id=uuid.uuid4(), patient_id=patient.id, doctor_id=doctor.id,
+            date=start + timedelta(days=index), time="08:00", status="Upcoming", type="Consultation",
+        ))
+        db.add(MedicalRecord(
+            id=uuid.uuid4(), patient_id=patient.id, doctor_id=doctor.id,
+            type="Lab", title=f"Result {index}", date=start + timedelta(days=index),
+        ))
+    db.commit()
+    data = {"patient": patient, "doctor": doctors[0]}
+    for user in data.values():
+        db.refresh(user)
+    db.expunge_all()
+    db.close()
+    return data
+
+@pytest.mark.parametrize("path, role", [
+    ("/api/patient/appointments", "patient"),
+    ("/api/patient/records", "patient"),
+    ("/api/doctor/patients/{patient_id}/records", "doctor"),
+])
+def test_listing_issues_one_statement(client, auth_headers, seeded, path, role):
+    headers = auth_headers(seeded[role])
+    with count_statements() as statements:
+        response = client.get(path.format(patient_id=seeded["patient"].id), headers=headers)
+
+    assert response.status_code == 200
+    rows = response.json()
+    assert len(rows) == ROWS
+    assert {row["doctor_name"] for row in rows} == {f"Doctor {index}" for index in range(ROWS)}
+    assert len(statements) == 1, statements
@@ -189,6 +189,7 @@ const BookAppointmentModal = ({ isOpen, onClose, onSuccess }: BookAppointmentMod
                                     </label>
                                     <input
                                         type="time"
+                                        step={1800}
                                         id="time"
                                         name="time"
                                         value={formData.time}